@@ -5,48 +5,87 @@ This file contains prototypes for advanced features that could be added to EZNet
 """
 
 import asyncio
+import copy
 import csv
+import functools
+import os
+import struct
 import time
-from typing import List, Dict, Any
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional
 from pathlib import Path
-import yaml
+from types import MappingProxyType
+from urllib.parse import quote
+
+# Imported once at module scope rather than per call. Guarded so the
+# eznet-independent parts (MonitorStore, ConfigManager) still import when
+# eznet isn't installed; the scanners check HAS_EZNET before use.
+try:
+    from eznet.cli import CheckerSet, run_all_checks, run_multi_host_checks
+    from eznet.tcp_check import TCPChecker
+    HAS_EZNET = True
+except ImportError:
+    HAS_EZNET = False
+
+
+def _require_eznet():
+    """Raise a clear error when a scanner is used without eznet installed."""
+    if not HAS_EZNET:
+        raise ImportError("eznet is required for scanning; install it with 'pip install eznet'")
 
 
 class MultiHostScanner:
     """Scanner for multiple hosts simultaneously."""
     
     def __init__(self, max_concurrent: int = 50):
+        _require_eznet()
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # One checker set for every host; its pooled HTTP client keeps
+        # TCP/TLS connections alive between checks
+        self._checkers = CheckerSet.create(5, max_concurrent)
+    
+    async def close(self):
+        """Close the shared HTTP client."""
+        await self._checkers.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     async def scan_hosts(self, hosts: List[str], port: int = None) -> Dict[str, Any]:
-        """Scan multiple hosts concurrently."""
-        async def scan_with_semaphore(host):
-            async with self.semaphore:
-                from eznet.cli import run_all_checks
-                return await run_all_checks(host, port, 5)
+        """
+        Scan multiple hosts concurrently through the CLI's multi-host worker pool.
         
-        tasks = [scan_with_semaphore(host) for host in hosts]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Args:
+            hosts: Hostnames or IP addresses to check
+            port: Optional port to probe on every host
         
-        return {
-            "scan_timestamp": time.time(),
-            "total_hosts": len(hosts),
-            "results": dict(zip(hosts, results))
-        }
+        Returns:
+            Dictionary with ``scan_timestamp`` (wall-clock seconds at the
+            start of the scan), ``total_hosts``, ``successful_hosts``,
+            ``total_duration_ms`` and ``results``, which maps each host to its
+            ``EZNetResult.to_dict()`` (or an error dict), in input order
+        """
+        scan_timestamp = time.time()
+        summary = await run_multi_host_checks(hosts, port, 5, self.max_concurrent, checkers=self._checkers)
+        summary["scan_timestamp"] = scan_timestamp
+        return summary
 
 
 class PortRangeScanner:
     """Scanner for port ranges."""
     
+    def __init__(self, timeout: int = 3):
+        _require_eznet()
+        self.tcp_checker = TCPChecker(timeout=timeout)
+    
     async def scan_port_range(self, host: str, start_port: int, end_port: int) -> Dict[str, Any]:
         """Scan a range of ports on a single host."""
-        from eznet.tcp_check import TCPChecker
-        
-        tcp_checker = TCPChecker(timeout=3)
         ports = list(range(start_port, end_port + 1))
         
-        result = await tcp_checker.scan_ports(host, ports, max_concurrent=50)
+        result = await self.tcp_checker.scan_ports(host, ports, max_concurrent=50)
         return result
     
     def get_common_ports(self) -> List[int]:
@@ -58,18 +97,248 @@ class PortRangeScanner:
         ]
 
 
+class _BitWriter:
+    """Append-only bit buffer used by the time-series encoder."""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+        self._bit_count = 0
+    
+    def write(self, value: int, bits: int):
+        """Write the low ``bits`` bits of ``value``, most significant first."""
+        for shift in range(bits - 1, -1, -1):
+            if self._bit_count % 8 == 0:
+                self.buffer.append(0)
+            if (value >> shift) & 1:
+                self.buffer[-1] |= 0x80 >> (self._bit_count % 8)
+            self._bit_count += 1
+
+
+class _BitReader:
+    """Sequential reader over a buffer produced by ``_BitWriter``."""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self._pos = 0
+    
+    def read(self, bits: int) -> int:
+        value = 0
+        for _ in range(bits):
+            byte = self.data[self._pos // 8]
+            value = (value << 1) | ((byte >> (7 - self._pos % 8)) & 1)
+            self._pos += 1
+        return value
+
+
+def _write_varint(out: bytearray, value: int):
+    """Append a zigzag-encoded signed varint."""
+    value = (value << 1) ^ (value >> 63)
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple:
+    """Read a zigzag-encoded signed varint, returning (value, new_pos)."""
+    shift = 0
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (value >> 1) ^ -(value & 1), pos
+
+
+class MonitorStore:
+    """
+    Compressed on-disk store for monitoring time-series.
+    
+    Samples are buffered per host and flushed in blocks of ``block_size``
+    to one file per host. Each block encodes timestamps with delta-of-delta
+    varints, response times with Gorilla XOR compression, and health flags
+    bit-packed eight per byte, so a regular 30s cadence costs a few bytes
+    per sample instead of a full result dict.
+    """
+    
+    BLOCK_HEADER = struct.Struct("<HIII")  # count, ts/rt/flags section sizes
+    
+    def __init__(self, directory: str, block_size: int = 1024):
+        # The block header stores the sample count as a uint16
+        if not 1 <= block_size <= 0xFFFF:
+            raise ValueError(f"block_size must be between 1 and 65535, got {block_size}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.block_size = block_size
+        self._pending: Dict[str, List[tuple]] = {}
+    
+    def path_for(self, host: str) -> Path:
+        """Return the data file used for a host."""
+        # Percent-encoding is reversible, so distinct hosts (``a:b``, ``a_b``,
+        # IPv6 literals) never share a file
+        safe_name = quote(host, safe="")
+        return self.directory / f"{safe_name}.ezts"
+    
+    def append(self, host: str, timestamp: float, response_time_ms: float, healthy: bool):
+        """Buffer one sample, flushing the host's block when it is full."""
+        samples = self._pending.setdefault(host, [])
+        samples.append((int(timestamp * 1000), float(response_time_ms), bool(healthy)))
+        if len(samples) >= self.block_size:
+            self.flush(host)
+    
+    def flush(self, host: Optional[str] = None):
+        """Write buffered samples for one host (or all hosts) to disk."""
+        hosts = [host] if host is not None else list(self._pending)
+        for name in hosts:
+            samples = self._pending.pop(name, None)
+            if samples:
+                with open(self.path_for(name), "ab") as f:
+                    f.write(self._encode_block(samples))
+    
+    def load(self, host: str) -> List[tuple]:
+        """Read back all flushed samples for a host as (ts, rt_ms, healthy)."""
+        path = self.path_for(host)
+        if not path.exists():
+            return []
+        
+        data = path.read_bytes()
+        samples = []
+        pos = 0
+        while pos < len(data):
+            count, ts_len, rt_len, flags_len = self.BLOCK_HEADER.unpack_from(data, pos)
+            pos += self.BLOCK_HEADER.size
+            ts_data = data[pos:pos + ts_len]
+            pos += ts_len
+            rt_data = data[pos:pos + rt_len]
+            pos += rt_len
+            flags_data = data[pos:pos + flags_len]
+            pos += flags_len
+            
+            timestamps = self._decode_timestamps(ts_data, count)
+            response_times = self._decode_floats(rt_data, count)
+            flags = [bool(flags_data[i // 8] >> (i % 8) & 1) for i in range(count)]
+            samples.extend((ts / 1000, rt, ok) for ts, rt, ok in zip(timestamps, response_times, flags))
+        return samples
+    
+    def _encode_block(self, samples: List[tuple]) -> bytes:
+        timestamps, response_times, flags = zip(*samples)
+        ts_data = self._encode_timestamps(timestamps)
+        rt_data = self._encode_floats(response_times)
+        
+        flags_data = bytearray((len(flags) + 7) // 8)
+        for i, ok in enumerate(flags):
+            if ok:
+                flags_data[i // 8] |= 1 << (i % 8)
+        
+        header = self.BLOCK_HEADER.pack(len(samples), len(ts_data), len(rt_data), len(flags_data))
+        return header + ts_data + rt_data + bytes(flags_data)
+    
+    @staticmethod
+    def _encode_timestamps(timestamps) -> bytes:
+        out = bytearray()
+        prev, prev_delta = 0, 0
+        for i, ts in enumerate(timestamps):
+            if i == 0:
+                _write_varint(out, ts)
+            else:
+                delta = ts - prev
+                _write_varint(out, delta - prev_delta)
+                prev_delta = delta
+            prev = ts
+        return bytes(out)
+    
+    @staticmethod
+    def _decode_timestamps(data: bytes, count: int) -> List[int]:
+        timestamps = []
+        pos = 0
+        prev, prev_delta = 0, 0
+        for i in range(count):
+            value, pos = _read_varint(data, pos)
+            if i == 0:
+                prev = value
+            else:
+                prev_delta += value
+                prev += prev_delta
+            timestamps.append(prev)
+        return timestamps
+    
+    @staticmethod
+    def _encode_floats(values) -> bytes:
+        writer = _BitWriter()
+        prev = 0
+        prev_leading, prev_trailing = -1, -1
+        for i, value in enumerate(values):
+            bits = struct.unpack("<Q", struct.pack("<d", value))[0]
+            if i == 0:
+                writer.write(bits, 64)
+                prev = bits
+                continue
+            
+            xor = bits ^ prev
+            prev = bits
+            if xor == 0:
+                writer.write(0, 1)
+                continue
+            
+            leading = min(64 - xor.bit_length(), 31)
+            trailing = (xor & -xor).bit_length() - 1
+            writer.write(1, 1)
+            if prev_leading != -1 and leading >= prev_leading and trailing >= prev_trailing:
+                # Meaningful bits fit inside the previous window
+                writer.write(0, 1)
+                writer.write(xor >> prev_trailing, 64 - prev_leading - prev_trailing)
+            else:
+                significant = 64 - leading - trailing
+                writer.write(1, 1)
+                writer.write(leading, 5)
+                writer.write(significant - 1, 6)
+                writer.write(xor >> trailing, significant)
+                prev_leading, prev_trailing = leading, trailing
+        return bytes(writer.buffer)
+    
+    @staticmethod
+    def _decode_floats(data: bytes, count: int) -> List[float]:
+        reader = _BitReader(data)
+        values = []
+        prev = 0
+        leading, trailing = 0, 0
+        for i in range(count):
+            if i == 0:
+                prev = reader.read(64)
+            elif reader.read(1):
+                if reader.read(1):
+                    leading = reader.read(5)
+                    significant = reader.read(6) + 1
+                    trailing = 64 - leading - significant
+                prev ^= reader.read(64 - leading - trailing) << trailing
+            values.append(struct.unpack("<d", struct.pack("<Q", prev))[0])
+        return values
+
+
 class ContinuousMonitor:
     """Continuous monitoring functionality."""
     
-    def __init__(self, interval: int = 30):
+    def __init__(self, interval: int = 30, history_size: int = 1000, store: Optional[MonitorStore] = None,
+                 keep_results: bool = False):
         self.interval = interval
         self.running = False
-        self.results_history = []
+        self.store = store
+        self.keep_results = keep_results
+        # Bounded history of (timestamp, iteration, healthy, response_time_ns)
+        # tuples; keep_results appends the full result dict for debugging
+        self.results_history = deque(maxlen=history_size)
+        # Running totals cover every iteration, not just the retained window
+        self.total_checks = 0
+        self.successful_checks = 0
+        # One health byte per retained check, written as a ring
+        self._health_ring = bytearray(max(1, history_size))
     
     async def monitor(self, host: str, port: int = None):
         """Monitor a host continuously."""
-        from eznet.cli import run_all_checks
-        
+        _require_eznet()
         self.running = True
         iteration = 0
         
@@ -77,32 +346,63 @@ class ContinuousMonitor:
         print(f"📊 Checking every {self.interval} seconds (Ctrl+C to stop)")
         print("-" * 60)
         
+        # Bind the per-host check once: every iteration reuses the same
+        # checkers (and pooled HTTP client) instead of building a set per cycle
+        checkers = CheckerSet.create(5)
+        check = functools.partial(run_all_checks, host, port, 5, checkers=checkers)
+        
+        # Iterations start on fixed deadlines, so the cadence doesn't stretch
+        # by however long each check takes
+        next_tick = time.monotonic()
+        
         try:
             while self.running:
                 iteration += 1
-                start_time = time.time()
+                # Wall clock only labels the sample; latency uses the monotonic counter
+                wall_ts = time.time()
+                t0 = time.perf_counter_ns()
                 
-                result = await run_all_checks(host, port, 5)
-                end_time = time.time()
+                # DNS goes through the checkers' TTL cache, so most iterations
+                # skip the resolver entirely
+                result = await check()
+                dt_ns = time.perf_counter_ns() - t0
+                dt_ms = dt_ns / 1_000_000
                 
-                # Store result
-                self.results_history.append({
-                    "timestamp": start_time,
-                    "iteration": iteration,
-                    "result": result.to_dict(),
-                    "response_time": end_time - start_time
-                })
+                # Health is evaluated once here and stored with the sample
+                healthy = int(self._is_healthy(result))
+                entry = (wall_ts, iteration, healthy, dt_ns)
+                if self.keep_results:
+                    entry += (result.to_dict(),)
+                self.results_history.append(entry)
+                
+                self._health_ring[self.total_checks % len(self._health_ring)] = healthy
+                self.total_checks += 1
+                self.successful_checks += healthy
+                
+                if self.store is not None:
+                    self.store.append(host, wall_ts, dt_ms, healthy)
                 
                 # Display summary
-                status = "🟢 UP" if self._is_healthy(result) else "🔴 DOWN"
-                print(f"[{time.strftime('%H:%M:%S')}] #{iteration:03d} - {status} - {(end_time-start_time)*1000:.1f}ms")
+                status = "🟢 UP" if healthy else "🔴 DOWN"
+                print(f"[{time.strftime('%H:%M:%S', time.localtime(wall_ts))}] #{iteration:03d} - {status} - {dt_ms:.1f}ms")
                 
                 # Wait for next iteration
-                await asyncio.sleep(self.interval)
+                next_tick += self.interval
+                now = time.monotonic()
+                if next_tick < now:
+                    # Overran the interval: start over from now rather than
+                    # firing the missed iterations back to back
+                    print(f"⚠️  Check took longer than the {self.interval}s interval")
+                    next_tick = now + self.interval
+                await asyncio.sleep(next_tick - now)
                 
         except KeyboardInterrupt:
             print(f"\n⏹️  Monitoring stopped after {iteration} iterations")
             self._generate_report()
+        finally:
+            await checkers.aclose()
+            if self.store is not None:
+                self.store.flush(host)
     
     def _is_healthy(self, result) -> bool:
         """Determine if the result indicates a healthy service."""
@@ -115,112 +415,242 @@ class ContinuousMonitor:
     
     def _generate_report(self):
         """Generate a summary report."""
-        if not self.results_history:
+        if not self.total_checks:
             return
         
-        total_checks = len(self.results_history)
-        successful_checks = sum(1 for r in self.results_history if self._is_healthy_dict(r["result"]))
+        total_checks = self.total_checks
+        successful_checks = self.successful_checks
         uptime_percentage = (successful_checks / total_checks) * 100
         
+        # bytearray.count runs in C, so the recent window costs one scan
+        recent = min(total_checks, len(self._health_ring))
+        recent_uptime = (self._health_ring.count(1) / recent) * 100
+        
         print("\n📊 Monitoring Report:")
         print(f"   Total checks: {total_checks}")
         print(f"   Successful: {successful_checks}")
         print(f"   Uptime: {uptime_percentage:.1f}%")
+        print(f"   Uptime (last {recent}): {recent_uptime:.1f}%")
+
+
+_BOOL_SAMPLE = {True: '1', False: '0'}
+
+# Shared stand-in for missing sections, so flattening never allocates
+_EMPTY = MappingProxyType({})
+
+_CSV_FIELDS = (
+    'host', 'port', 'dns_ipv4_success', 'dns_ipv6_success',
+    'tcp_success', 'tcp_response_time_ms', 'http_success', 'http_status_code',
+    'icmp_success', 'icmp_response_time_ms', 'total_duration_ms',
+)
+
+
+def _flatten_csv_row(result: Dict[str, Any]) -> tuple:
+    """Flatten one nested result into a row ordered like ``_CSV_FIELDS``."""
+    get = result.get
+    dns = get('dns') or _EMPTY
+    tcp = get('tcp') or _EMPTY
+    http = get('http') or _EMPTY
+    icmp = get('icmp') or _EMPTY
+    return (
+        get('host'),
+        get('port'),
+        (dns.get('ipv4') or _EMPTY).get('success'),
+        (dns.get('ipv6') or _EMPTY).get('success'),
+        tcp.get('success'),
+        tcp.get('response_time_ms'),
+        http.get('success'),
+        http.get('status_code'),
+        icmp.get('success'),
+        icmp.get('response_time_ms'),
+        get('duration_ms'),
+    )
+
+
+# Bit order of the packed flags column, lowest bit first
+FLAG_NAMES = ('dns_ipv4', 'dns_ipv6', 'tcp', 'http', 'icmp')
+
+_CSV_PACKED_FIELDS = (
+    'host', 'port', 'flags', 'tcp_response_time_ms', 'http_status_code',
+    'icmp_response_time_ms', 'total_duration_ms',
+)
+
+
+def _pack_csv_row(row: tuple) -> tuple:
+    """Collapse the success columns of a flattened row into one hex bitmask."""
+    bits = (bool(row[2]) | bool(row[3]) << 1 | bool(row[4]) << 2
+            | bool(row[6]) << 3 | bool(row[8]) << 4)
+    return (row[0], row[1], format(bits, '02x'), row[5], row[7], row[9], row[10])
+
+
+def unpack_flags(bits) -> Dict[str, bool]:
+    """
+    Decode a packed flags value written by ``OutputFormatter.to_csv``.
+    
+    Args:
+        bits: Bitmask as an int or as the hex string stored in the CSV
     
-    def _is_healthy_dict(self, result_dict: Dict) -> bool:
-        """Check health from dictionary result."""
-        return (result_dict.get("tcp", {}).get("success", False) or 
-                result_dict.get("icmp", {}).get("success", False))
+    Returns:
+        Mapping of check name to success
+    """
+    if isinstance(bits, str):
+        bits = int(bits, 16)
+    return {name: bool(bits >> i & 1) for i, name in enumerate(FLAG_NAMES)}
 
 
 class OutputFormatter:
     """Advanced output formatting."""
     
     @staticmethod
-    def to_csv(results: List[Dict[str, Any]], filepath: str):
-        """Export results to CSV format."""
-        if not results:
+    def to_csv(results: List[Dict[str, Any]], filepath: str, packed_flags: bool = False):
+        """
+        Export results to CSV format.
+        
+        With ``packed_flags`` the five success columns collapse into one
+        ``flags`` column holding a two-digit hex bitmask; decode it with
+        ``unpack_flags``.
+        """
+        # Stream rows straight into the writer instead of building a flattened copy
+        rows = map(_flatten_csv_row, results)
+        fields = _CSV_FIELDS
+        if packed_flags:
+            rows = map(_pack_csv_row, rows)
+            fields = _CSV_PACKED_FIELDS
+        first = next(rows, None)
+        if first is None:
             return
         
-        with open(filepath, 'w', newline='') as csvfile:
-            # Flatten the nested structure for CSV
-            flattened = []
-            for result in results:
-                flat = {
-                    'host': result.get('host'),
-                    'port': result.get('port'),
-                    'dns_ipv4_success': result.get('dns', {}).get('ipv4', {}).get('success'),
-                    'dns_ipv6_success': result.get('dns', {}).get('ipv6', {}).get('success'),
-                    'tcp_success': result.get('tcp', {}).get('success'),
-                    'tcp_response_time_ms': result.get('tcp', {}).get('response_time_ms'),
-                    'http_success': result.get('http', {}).get('success'),
-                    'http_status_code': result.get('http', {}).get('status_code'),
-                    'icmp_success': result.get('icmp', {}).get('success'),
-                    'icmp_response_time_ms': result.get('icmp', {}).get('response_time_ms'),
-                    'total_duration_ms': result.get('duration_ms')
-                }
-                flattened.append(flat)
-            
-            if flattened:
-                writer = csv.DictWriter(csvfile, fieldnames=flattened[0].keys())
-                writer.writeheader()
-                writer.writerows(flattened)
+        with open(filepath, 'w', newline='', buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fields)
+            writer.writerow(first)
+            writer.writerows(rows)
     
     @staticmethod
-    def to_prometheus(results: Dict[str, Any]) -> str:
-        """Export results in Prometheus metrics format."""
-        metrics = []
-        timestamp = int(time.time() * 1000)
+    def to_prometheus(results: Dict[str, Any], include_timestamp: bool = True) -> str:
+        """
+        Export results in Prometheus metrics format.
         
+        Set ``include_timestamp=False`` when the output is scraped, since
+        Prometheus records its own scrape time.
+        """
         result = results.get('results', results)  # Handle both single and multi-host
         
+        # Label sets and the sample suffix are built once per result
+        host_labels = '{host="' + str(result.get("host")) + '"} '
+        port_labels = '{host="' + str(result.get("host")) + '",port="' + str(result.get("port", "")) + '"} '
+        suffix = ' ' + str(int(time.time() * 1000)) if include_timestamp else ''
+        metrics = []
+        append = metrics.append
+        
         # DNS metrics
         if 'dns' in result:
             dns = result['dns']
             if 'ipv4' in dns:
-                metrics.append(f'eznet_dns_ipv4_success{{host="{result["host"]}"}} {int(dns["ipv4"]["success"])} {timestamp}')
+                append('eznet_dns_ipv4_success' + host_labels + _BOOL_SAMPLE[bool(dns["ipv4"]["success"])] + suffix)
             if 'ipv6' in dns:
-                metrics.append(f'eznet_dns_ipv6_success{{host="{result["host"]}"}} {int(dns["ipv6"]["success"])} {timestamp}')
+                append('eznet_dns_ipv6_success' + host_labels + _BOOL_SAMPLE[bool(dns["ipv6"]["success"])] + suffix)
         
         # TCP metrics
-        if 'tcp' in result and result['tcp']:
-            tcp = result['tcp']
-            metrics.append(f'eznet_tcp_success{{host="{result["host"]}",port="{result.get("port", "")}"}} {int(tcp.get("success", False))} {timestamp}')
+        tcp = result.get('tcp')
+        if tcp:
+            append('eznet_tcp_success' + port_labels + _BOOL_SAMPLE[bool(tcp.get("success"))] + suffix)
             if 'response_time_ms' in tcp:
-                metrics.append(f'eznet_tcp_response_time_ms{{host="{result["host"]}",port="{result.get("port", "")}"}} {tcp["response_time_ms"]} {timestamp}')
+                append('eznet_tcp_response_time_ms' + port_labels + str(tcp["response_time_ms"]) + suffix)
         
         # HTTP metrics
-        if 'http' in result and result['http']:
-            http = result['http']
-            metrics.append(f'eznet_http_success{{host="{result["host"]}",port="{result.get("port", "")}"}} {int(http.get("success", False))} {timestamp}')
+        http = result.get('http')
+        if http:
+            append('eznet_http_success' + port_labels + _BOOL_SAMPLE[bool(http.get("success"))] + suffix)
             if 'status_code' in http:
-                metrics.append(f'eznet_http_status_code{{host="{result["host"]}",port="{result.get("port", "")}"}} {http["status_code"]} {timestamp}')
+                append('eznet_http_status_code' + port_labels + str(http["status_code"]) + suffix)
         
         # ICMP metrics
-        if 'icmp' in result and result['icmp']:
-            icmp = result['icmp']
-            metrics.append(f'eznet_icmp_success{{host="{result["host"]}"}} {int(icmp.get("success", False))} {timestamp}')
+        icmp = result.get('icmp')
+        if icmp:
+            append('eznet_icmp_success' + host_labels + _BOOL_SAMPLE[bool(icmp.get("success"))] + suffix)
             if 'response_time_ms' in icmp:
-                metrics.append(f'eznet_icmp_response_time_ms{{host="{result["host"]}"}} {icmp["response_time_ms"]} {timestamp}')
+                append('eznet_icmp_response_time_ms' + host_labels + str(icmp["response_time_ms"]) + suffix)
         
         return '\n'.join(metrics)
+    
+    @staticmethod
+    def to_prometheus_bytes(results: Dict[str, Any], buffer: bytearray, include_timestamp: bool = True) -> bytearray:
+        """Append Prometheus metrics to ``buffer`` for building an HTTP body in place."""
+        buffer += OutputFormatter.to_prometheus(results, include_timestamp).encode()
+        return buffer
 
 
 class ConfigManager:
     """Configuration file management."""
     
+    # Parsed files keyed by (kind, path, mtime_ns); an edit changes the key
+    _cache: "OrderedDict[tuple, Any]" = OrderedDict()
+    _cache_size = 32
+    # Hosts files larger than this are rejected rather than read into memory
+    _max_hosts_file_bytes = 1_048_576
+    
+    @classmethod
+    def _cached_load(cls, kind: str, filepath: str, parse):
+        key = (kind, os.path.abspath(filepath), os.stat(filepath).st_mtime_ns)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+        
+        value = parse(filepath)
+        cls._cache[key] = value
+        if len(cls._cache) > cls._cache_size:
+            cls._cache.popitem(last=False)
+        return value
+    
+    @classmethod
+    def _parse_hosts_file(cls, filepath: str) -> List[str]:
+        # Read one byte past the cap so an oversized file is detected, not truncated
+        with open(filepath, 'rb') as f:
+            data = f.read(cls._max_hosts_file_bytes + 1)
+        if len(data) > cls._max_hosts_file_bytes:
+            raise ValueError(f"Hosts file {filepath} exceeds {cls._max_hosts_file_bytes} bytes")
+        
+        # Comments are dropped at the bytes level, before any decoding; strip()
+        # runs once per line, and repeated hosts are kept once, in order
+        hosts = {}
+        for lineno, line in enumerate(data.splitlines(), 1):
+            entry = line.strip()
+            if not entry or entry[:1] == b'#':
+                continue
+            try:
+                host = entry.decode('utf-8')
+                # Internationalized names are resolved in their ASCII (punycode) form
+                if not host.isascii():
+                    host = host.encode('idna').decode('ascii')
+            except UnicodeError as e:
+                raise ValueError(f"{filepath}:{lineno}: invalid host name {entry!r}: {e}") from None
+            hosts[host] = None
+        return list(hosts)
+    
     @staticmethod
-    def load_hosts_file(filepath: str) -> List[str]:
-        """Load hosts from a text file (one per line)."""
+    def _parse_config_file(filepath: str) -> Dict[str, Any]:
+        # yaml is imported on first use; most callers never touch config files
+        import yaml
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         with open(filepath, 'r') as f:
-            hosts = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-        return hosts
+            return yaml.load(f, Loader=loader)
     
-    @staticmethod
-    def load_config_file(filepath: str) -> Dict[str, Any]:
+    @classmethod
+    def load_hosts_file(cls, filepath: str) -> List[str]:
+        """Load hosts from a text file (one per line)."""
+        return list(cls._cached_load("hosts", filepath, cls._parse_hosts_file))
+    
+    @classmethod
+    async def load_hosts_file_async(cls, filepath: str) -> List[str]:
+        """Load hosts from a text file in a worker thread, keeping the event loop free."""
+        return await asyncio.to_thread(cls.load_hosts_file, filepath)
+    
+    @classmethod
+    def load_config_file(cls, filepath: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        with open(filepath, 'r') as f:
-            return yaml.safe_load(f)
+        # Callers may mutate the config, so hand out a copy of the cached parse
+        return copy.deepcopy(cls._cached_load("config", filepath, cls._parse_config_file))
     
     @staticmethod
     def create_sample_config(filepath: str):
@@ -247,6 +677,7 @@ class ConfigManager:
             ]
         }
         
+        import yaml
         with open(filepath, 'w') as f:
             yaml.dump(sample_config, f, default_flow_style=False, indent=2)
 
@@ -254,9 +685,9 @@ class ConfigManager:
 # Example usage functions
 async def demo_multi_host():
     """Demonstrate multi-host scanning."""
-    scanner = MultiHostScanner(max_concurrent=10)
     hosts = ['google.com', 'github.com', 'stackoverflow.com']
-    results = await scanner.scan_hosts(hosts, 80)
+    async with MultiHostScanner(max_concurrent=10) as scanner:
+        results = await scanner.scan_hosts(hosts, 80)
     print("Multi-host scan results:", results)
 
 
@@ -6,13 +6,22 @@ This script demonstrates different ways to use EZNet for network testing.
 """
 
 import asyncio
-import subprocess
-import json
+import os
 import sys
-from pathlib import Path
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 # Add the src directory to the path so we can import eznet
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
 
 from eznet.cli import run_all_checks, display_results
 
@@ -63,12 +72,12 @@ async def demo_json_output():
     print("=" * 50)
     
     result = await run_all_checks("github.com", 22, 5)
-    print(json.dumps(result.to_dict(), indent=2))
+    print(_dumps(result.to_dict()).decode())
     print("\n")
 
 
 def demo_cli_usage():
-    """Demonstrate CLI usage with subprocess."""
+    """Demonstrate CLI usage."""
     print("💻 CLI Usage Examples")
     print("=" * 50)
     
@@ -7,10 +7,10 @@ all network tests asynchronously.
 """
 
 import asyncio
-import json
+import contextlib
 import sys
-import datetime
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Optional
 
 import click
 from rich.console import Console
@@ -19,22 +19,89 @@ from rich.panel import Panel
 from rich.text import Text
 from rich import box
 
-from .dns_check import DNSChecker
+from .dns_check import DNSChecker, HAS_AIODNS
 from .tcp_check import TCPChecker
 from .http_check import HTTPChecker
 from .icmp_check import ICMPChecker
 from .ssl_check import SSLChecker
-from .utils import format_duration, is_valid_ip, is_valid_hostname, parse_ports, get_common_ports, get_port_description
+from .utils import expand_hosts, format_duration, is_valid_host, parse_ports, get_common_ports, PORT_DESCRIPTIONS
 
 
 console = Console()
+err_console = Console(stderr=True)
+
+def _json_default(obj: Any) -> Any:
+    """Serialize result objects (e.g. SecurityHeaderReport) through their to_dict()."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+    
+    def dump_json(payload: Any, indent: bool = True) -> bytes:
+        """Serialize ``payload`` as JSON bytes, indented or compact."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(payload, default=_json_default, option=option)
+except ImportError:
+    import json
+    
+    def dump_json(payload: Any, indent: bool = True) -> bytes:
+        """Serialize ``payload`` as JSON bytes, indented or compact."""
+        if indent:
+            return json.dumps(payload, indent=2, default=_json_default).encode()
+        return json.dumps(payload, separators=(",", ":"), default=_json_default).encode()
+
+# uvloop's libuv-based loop handles high socket fan-out faster when available
+try:
+    import uvloop
+    _loop_factory = uvloop.new_event_loop
+except ImportError:
+    _loop_factory = None
 
 # SSL detailed mode is now always enabled when --ssl-check is used
 
+# Ports that get an HTTP probe, and ports that speak TLS for --ssl-check
+WEB_PORTS = frozenset({80, 443, 8080, 8443})
+TLS_PORTS = frozenset({443, 8443, 993, 995, 465, 587, 636})
+
+# Without aiodns every lookup holds a resolver thread, so multi-host runs
+# are throttled to keep the thread pool from saturating
+_NO_AIODNS_MAX_CONCURRENT = 16
+
+
+# Section titles and status cells shared by the display functions
+_TITLE_DNS = "🌐 DNS Resolution"
+_TITLE_TCP = "🔌 TCP Connection"
+_TITLE_HTTP = "🌍 HTTP Check"
+_TITLE_HTTP_SERVICES = "🌍 HTTP Services"
+_TITLE_SSL = "🔒 SSL/TLS Certificate"
+_TITLE_SSL_PORTS = "🔒 SSL/TLS Certificates"
+_TITLE_ICMP = "🏓 ICMP Ping"
+_TITLE_PORTS = "🔍 Port Scan Results"
+_TITLE_HOSTS = "📊 Host Summary"
+
+_STATUS_SUCCESS = "✅ Success"
+_STATUS_FAILED = "❌ Failed"
+_STATUS_OPEN = "✅ Open"
+_STATUS_CLOSED = "❌ Closed"
+_STATUS_FILTERED = "❌ Closed/Filtered"
+_STATUS_REACHABLE = "✅ Reachable"
+_STATUS_UNREACHABLE = "❌ Unreachable"
+
 
 class EZNetResult:
     """Container for all network probe results."""
     
+    # One instance per host; slots keep large multi-host scans lean
+    __slots__ = (
+        "host", "ports", "dns_results", "tcp_results", "http_results",
+        "ssl_results", "icmp_result", "start_time", "end_time", "duration_ms"
+    )
+    
     def __init__(self, host: str, ports: Optional[list] = None):
         self.host = host
         self.ports = ports or []
@@ -45,6 +112,7 @@ class EZNetResult:
         self.icmp_result = {}
         self.start_time = None
         self.end_time = None
+        self.duration_ms = None
     
     @property
     def port(self):
@@ -65,100 +133,208 @@ class EZNetResult:
             return self.http_results.get(self.ports[0], {})
         return {}
     
+    @classmethod
+    def from_dict(cls, host: str, data: Dict[str, Any]) -> "EZNetResult":
+        """Rebuild a result from its ``to_dict()`` form (timings are not restored)."""
+        ports = data.get("ports")
+        if ports is None:
+            ports = [data["port"]] if data.get("port") else []
+        result = cls(host, ports)
+        result.dns_results = data.get("dns") or {}
+        result.icmp_result = data.get("icmp") or {}
+        result.tcp_results = data.get("tcp") or {}
+        result.http_results = data.get("http") or {}
+        result.ssl_results = data.get("ssl") or {}
+        result.duration_ms = data.get("duration_ms")
+        return result
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert results to dictionary for JSON output."""
+        tcp_results, http_results, ssl_results = self.tcp_results, self.http_results, self.ssl_results
         result = {
             "host": self.host,
             "ports": self.ports,
             "dns": self.dns_results,
             "icmp": self.icmp_result,
-            "duration_ms": format_duration(self.start_time, self.end_time) if self.start_time and self.end_time else None
+            "duration_ms": self.duration_ms
         }
         
         # Add port-specific results
-        if self.tcp_results:
-            result["tcp"] = self.tcp_results
-        if self.http_results:
-            result["http"] = self.http_results
-        if self.ssl_results:
-            result["ssl"] = self.ssl_results
+        if tcp_results:
+            result["tcp"] = tcp_results
+        if http_results:
+            result["http"] = http_results
+        if ssl_results:
+            result["ssl"] = ssl_results
         
         # Backward compatibility for single port
-        if len(self.ports) == 1:
-            port = self.ports[0]
+        if (port := self.port) is not None:
             result["port"] = port
-            if port in self.tcp_results:
-                result["tcp_single"] = self.tcp_results[port]
-            if port in self.http_results:
-                result["http_single"] = self.http_results[port]
-            if port in self.ssl_results:
-                result["ssl_single"] = self.ssl_results[port]
+            if (tcp := tcp_results.get(port)) is not None:
+                result["tcp_single"] = tcp
+            if (http := http_results.get(port)) is not None:
+                result["http_single"] = http
+            if (ssl := ssl_results.get(port)) is not None:
+                result["ssl_single"] = ssl
         
         return result
 
 
-async def run_port_scan(host: str, ports: list, timeout: int, ssl_check: bool, max_concurrent: int = 50) -> EZNetResult:
-    """Run port scanning tests on multiple ports."""
-    result = EZNetResult(host, ports)
-    result.start_time = asyncio.get_event_loop().time()
-    
-    # Initialize checkers
-    dns_checker = DNSChecker(timeout=timeout)
-    tcp_checker = TCPChecker(timeout=timeout)
-    http_checker = HTTPChecker(timeout=timeout)
-    icmp_checker = ICMPChecker(timeout=timeout)
-    ssl_checker = SSLChecker(timeout=timeout) if ssl_check else None
-    
-    # Run DNS and ICMP once (not port-specific)
-    dns_task = dns_checker.check(host)
-    icmp_task = icmp_checker.check(host)
+def first_ipv4(dns_result: Any) -> Optional[str]:
+    """Return the first IPv4 address of a DNS result, or None."""
+    if not isinstance(dns_result, dict):
+        return None
+    ipv4 = dns_result.get("ipv4", {})
+    addresses = ipv4.get("addresses") if ipv4.get("success") else None
+    return addresses[0] if addresses else None
+
+
+@dataclass
+class CheckerSet:
+    """One set of checkers shared by every host and port in a run."""
+    
+    dns: DNSChecker
+    tcp: TCPChecker
+    http: HTTPChecker
+    icmp: ICMPChecker
+    ssl: SSLChecker
+    limiter: asyncio.Semaphore
+    
+    @classmethod
+    def create(cls, timeout: int, max_concurrent: Optional[int] = None,
+               include_headers: bool = True) -> "CheckerSet":
+        """
+        Build a checker set.
+        
+        Args:
+            timeout: Timeout in seconds for every checker
+            max_concurrent: Cap on in-flight probes across all hosts and ports,
+                and size of the HTTP connection pool; None keeps the
+                HTTPChecker's default pool limits
+            include_headers: Keep full HTTP response headers in results; only
+                JSON output shows them, so table output turns this off
+        
+        Returns:
+            CheckerSet to pass to the run_* functions and ``aclose()`` when done
+        """
+        if max_concurrent:
+            http = HTTPChecker(timeout=timeout, max_connections=max_concurrent * 2,
+                               include_headers=include_headers)
+        else:
+            http = HTTPChecker(timeout=timeout, include_headers=include_headers)
+        return cls(
+            dns=DNSChecker(timeout=timeout),
+            tcp=TCPChecker(timeout=timeout),
+            http=http,
+            icmp=ICMPChecker(timeout=timeout),
+            ssl=SSLChecker(timeout=timeout),
+            limiter=asyncio.Semaphore(max_concurrent or 50)
+        )
     
-    # Run port-specific checks concurrently
-    semaphore = asyncio.Semaphore(max_concurrent)
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if any."""
+        await self.http.aclose()
+
+
+async def run_port_scan(host: str, ports: list, timeout: int, ssl_check: bool, max_concurrent: int = 50,
+                        checkers: Optional[CheckerSet] = None,
+                        on_port_result: Optional[Callable[[int, Any], None]] = None) -> EZNetResult:
+    """Run port scanning tests on multiple ports.
     
+    ``on_port_result(port, outcome)`` is called as each port finishes, with
+    the port's (tcp, http, ssl) triple or the exception that aborted it.
+    """
+    result = EZNetResult(host, ports)
+    loop = asyncio.get_running_loop()
+    result.start_time = loop.time()
+    
+    # Reuse the caller's checkers when given; their limiter is shared with
+    # other scans, so max_concurrent then caps this call on its own
+    owned = checkers is None
+    if owned:
+        checkers = CheckerSet.create(timeout, max_concurrent)
+        call_limit = contextlib.nullcontext()
+    else:
+        call_limit = asyncio.Semaphore(max(1, max_concurrent))
+    dns_checker = checkers.dns
+    tcp_checker = checkers.tcp
+    http_checker = checkers.http
+    icmp_checker = checkers.icmp
+    ssl_checker = checkers.ssl
+    
+    # Run DNS and ICMP once (not port-specific); DNS is awaited up front so
+    # every port connects to the resolved address instead of looking it up again
+    icmp_task = asyncio.ensure_future(icmp_checker.check(host))
+    dns_task = asyncio.ensure_future(dns_checker.check(host))
+    await asyncio.wait([dns_task])
+    ip = None if dns_task.exception() else first_ipv4(dns_task.result())
+    
+    # Run port-specific checks concurrently, bounded by the shared limiter
     async def check_port_with_semaphore(port):
-        async with semaphore:
-            tasks = [tcp_checker.check(host, port)]
+        """Probe one port; returns it with a (tcp, http, ssl) triple, None for skipped checks."""
+        async with call_limit, checkers.limiter:
+            tasks = [tcp_checker.check(host, port, ip=ip)]
             
             # Add HTTP check for web ports
-            if port in [80, 443, 8080, 8443]:
-                tasks.append(http_checker.check(host, port))
+            is_web = port in WEB_PORTS
+            if is_web:
+                tasks.append(http_checker.check(host, port, ip=ip))
             
             # Add SSL check for HTTPS ports
-            if ssl_check and port in [443, 8443, 993, 995, 465, 587, 636]:
+            is_tls = ssl_check and port in TLS_PORTS
+            if is_tls:
                 tasks.append(ssl_checker.check(host, port, detailed=True))
             
-            return await asyncio.gather(*tasks, return_exceptions=True)
+            outcomes = iter(await asyncio.gather(*tasks, return_exceptions=True))
+            return port, (next(outcomes), next(outcomes) if is_web else None, next(outcomes) if is_tls else None)
     
-    # Execute all tasks
-    dns_result, icmp_result = await asyncio.gather(dns_task, icmp_task, return_exceptions=True)
-    port_results = await asyncio.gather(*[check_port_with_semaphore(port) for port in ports], return_exceptions=True)
+    async def probe(port):
+        try:
+            return await check_port_with_semaphore(port)
+        except Exception as e:
+            return port, e
+    
+    # Ports are collected as they complete while ICMP keeps running alongside
+    port_tasks = [asyncio.ensure_future(probe(port)) for port in ports]
+    outcomes = {}
+    try:
+        for next_done in asyncio.as_completed(port_tasks):
+            port, outcome = await next_done
+            outcomes[port] = outcome
+            if on_port_result is not None:
+                on_port_result(port, outcome)
+        dns_result, icmp_result = await asyncio.gather(dns_task, icmp_task, return_exceptions=True)
+    finally:
+        for task in port_tasks:
+            task.cancel()
+        icmp_task.cancel()
+        if owned:
+            await checkers.aclose()
+    port_results = [outcomes[port] for port in ports]
     
     # Process results
     result.dns_results = dns_result if not isinstance(dns_result, Exception) else {"error": str(dns_result)}
     result.icmp_result = icmp_result if not isinstance(icmp_result, Exception) else {"error": str(icmp_result)}
     
-    # Process port-specific results
-    for i, port_result_list in enumerate(port_results):
-        port = ports[i]
-        
-        if isinstance(port_result_list, Exception):
-            result.tcp_results[port] = {"error": str(port_result_list)}
+    # Process port-specific results in one pass over fixed (tcp, http, ssl) slots
+    tcp_results, http_results, ssl_results = {}, {}, {}
+    for port, outcome in zip(ports, port_results):
+        if isinstance(outcome, Exception):
+            tcp_results[port] = {"error": str(outcome)}
             continue
         
-        # TCP result is always first
-        if len(port_result_list) > 0 and not isinstance(port_result_list[0], Exception):
-            result.tcp_results[port] = port_result_list[0]
-        
-        # HTTP result (if requested)
-        if len(port_result_list) > 1 and not isinstance(port_result_list[1], Exception):
-            result.http_results[port] = port_result_list[1]
-        
-        # SSL result (if requested)
-        if len(port_result_list) > 2 and not isinstance(port_result_list[2], Exception):
-            result.ssl_results[port] = port_result_list[2]
-    
-    result.end_time = asyncio.get_event_loop().time()
+        tcp, http, ssl = outcome
+        if tcp is not None and not isinstance(tcp, Exception):
+            tcp_results[port] = tcp
+        if http is not None and not isinstance(http, Exception):
+            http_results[port] = http
+        if ssl is not None and not isinstance(ssl, Exception):
+            ssl_results[port] = ssl
+    
+    result.tcp_results, result.http_results, result.ssl_results = tcp_results, http_results, ssl_results
+    
+    result.end_time = loop.time()
+    result.duration_ms = format_duration(result.start_time, result.end_time)
     return result
 
 
@@ -167,25 +343,30 @@ def display_port_scan_results(result: EZNetResult) -> None:
     
     # Create main title
     ports_desc = f"{len(result.ports)} ports" if len(result.ports) > 1 else f"port {result.ports[0]}"
+    
+    # Sort once; the HTTP and SSL sections walk only their own results
+    sorted_ports = sorted(result.ports)
+    web_ports = sorted(p for p, r in result.http_results.items() if r.get("success"))
+    ssl_ports = sorted(p for p, r in result.ssl_results.items() if isinstance(r, dict) and r.get("success"))
     title = f"EZNet Port Scan Results for {result.host} ({ports_desc})"
     
     console.print(Panel(title, style="bold blue"))
     
     # DNS Results (same as before)
     if result.dns_results:
-        dns_table = Table(title="🌐 DNS Resolution", box=box.ROUNDED)
+        dns_table = Table(title=_TITLE_DNS, box=box.ROUNDED)
         dns_table.add_column("Record Type", style="cyan")
         dns_table.add_column("Status", style="green")
         dns_table.add_column("Result", style="white")
         
         dns_data = result.dns_results
         if "ipv4" in dns_data:
-            status = "✅ Success" if dns_data["ipv4"]["success"] else "❌ Failed"
+            status = _STATUS_SUCCESS if dns_data["ipv4"]["success"] else _STATUS_FAILED
             addresses = ", ".join(dns_data["ipv4"].get("addresses", [])) if dns_data["ipv4"]["success"] else dns_data["ipv4"].get("error", "")
             dns_table.add_row("IPv4 (A)", status, addresses)
         
         if "ipv6" in dns_data:
-            status = "✅ Success" if dns_data["ipv6"]["success"] else "❌ Failed"
+            status = _STATUS_SUCCESS if dns_data["ipv6"]["success"] else _STATUS_FAILED
             addresses = ", ".join(dns_data["ipv6"].get("addresses", [])) if dns_data["ipv6"]["success"] else dns_data["ipv6"].get("error", "")
             dns_table.add_row("IPv6 (AAAA)", status, addresses)
         
@@ -194,26 +375,24 @@ def display_port_scan_results(result: EZNetResult) -> None:
     
     # Port Scan Results
     if result.tcp_results:
-        port_table = Table(title="🔍 Port Scan Results", box=box.ROUNDED)
+        port_table = Table(title=_TITLE_PORTS, box=box.ROUNDED)
         port_table.add_column("Port", style="cyan")
         port_table.add_column("Service", style="yellow")
         port_table.add_column("Status", style="green")
         port_table.add_column("Response Time", style="white")
         
-        # Sort ports for better display
-        sorted_ports = sorted(result.ports)
         open_ports = []
         
         for port in sorted_ports:
             tcp_data = result.tcp_results.get(port, {})
-            service = get_port_description(port)
+            service = PORT_DESCRIPTIONS.get(port, "Unknown")
             
             if tcp_data.get("success"):
-                status = "✅ Open"
+                status = _STATUS_OPEN
                 response_time = f"{tcp_data.get('response_time_ms', 0):.1f} ms"
                 open_ports.append(port)
             else:
-                status = "❌ Closed"
+                status = _STATUS_CLOSED
                 response_time = tcp_data.get("error", "Connection failed")
             
             port_table.add_row(str(port), service, status, response_time)
@@ -229,15 +408,14 @@ def display_port_scan_results(result: EZNetResult) -> None:
         console.print()
     
     # HTTP Results for open web ports
-    web_ports = [p for p in result.ports if p in result.http_results and result.http_results[p].get("success")]
     if web_ports:
-        http_table = Table(title="🌍 HTTP Services", box=box.ROUNDED)
+        http_table = Table(title=_TITLE_HTTP_SERVICES, box=box.ROUNDED)
         http_table.add_column("Port", style="cyan")
         http_table.add_column("Status", style="green")
         http_table.add_column("Server", style="white")
         http_table.add_column("Response Time", style="white")
         
-        for port in sorted(web_ports):
+        for port in web_ports:
             http_data = result.http_results[port]
             status = f"{http_data.get('status_code')} {http_data.get('reason_phrase', '')}"
             server = http_data.get('server', 'Unknown')
@@ -249,15 +427,14 @@ def display_port_scan_results(result: EZNetResult) -> None:
         console.print()
     
     # SSL Results
-    ssl_ports = [p for p in result.ports if p in result.ssl_results and isinstance(result.ssl_results[p], dict) and result.ssl_results[p].get("success")]
     if ssl_ports:
-        ssl_table = Table(title="🔒 SSL/TLS Certificates", box=box.ROUNDED)
+        ssl_table = Table(title=_TITLE_SSL_PORTS, box=box.ROUNDED)
         ssl_table.add_column("Port", style="cyan")
         ssl_table.add_column("Grade", style="green")
         ssl_table.add_column("Valid Until", style="white")
         ssl_table.add_column("Issuer", style="white")
         
-        for port in sorted(ssl_ports):
+        for port in ssl_ports:
             ssl_data = result.ssl_results[port]
             cert = ssl_data.get("certificate", {})
             security = ssl_data.get("security_score", {})
@@ -265,28 +442,8 @@ def display_port_scan_results(result: EZNetResult) -> None:
             grade = security.get("grade", "?")
             grade_color = "green" if grade.startswith("A") else "yellow" if grade in ["B", "C"] else "red"
             
-            valid_until = cert.get("not_after", "Unknown")
-            if valid_until != "Unknown" and "GMT" in valid_until:
-                try:
-                    # Parse the date string format from SSL certificate
-                    date_obj = datetime.datetime.strptime(valid_until, "%b %d %H:%M:%S %Y GMT")
-                    valid_until = date_obj.strftime("%Y-%m-%d")
-                except:
-                    pass
-            
-            # Extract issuer organization name
-            issuer_info = cert.get("issuer", "Unknown")
-            if isinstance(issuer_info, str) and "CN=" in issuer_info:
-                # Extract just the CN part
-                issuer_parts = issuer_info.split(",")
-                for part in issuer_parts:
-                    if "CN=" in part:
-                        issuer_org = part.strip().replace("CN=", "")
-                        break
-                else:
-                    issuer_org = "Unknown"
-            else:
-                issuer_org = "Unknown"
+            valid_until = cert.get("not_after_iso") or cert.get("not_after", "Unknown")
+            issuer_org = cert.get("issuer_cn") or "Unknown"
             
             ssl_table.add_row(
                 str(port), 
@@ -300,13 +457,13 @@ def display_port_scan_results(result: EZNetResult) -> None:
     
     # ICMP Results
     if result.icmp_result:
-        icmp_table = Table(title="🏓 ICMP Ping", box=box.ROUNDED)
+        icmp_table = Table(title=_TITLE_ICMP, box=box.ROUNDED)
         icmp_table.add_column("Target", style="cyan")
         icmp_table.add_column("Status", style="green")
         icmp_table.add_column("Response Time", style="white")
         
         icmp_data = result.icmp_result
-        status = "✅ Reachable" if icmp_data.get("success") else "❌ Unreachable"
+        status = _STATUS_REACHABLE if icmp_data.get("success") else _STATUS_UNREACHABLE
         response_time = f"{icmp_data.get('response_time_ms', 0):.1f} ms" if icmp_data.get("success") else icmp_data.get("error", "")
         icmp_table.add_row(result.host, status, response_time)
         
@@ -319,52 +476,130 @@ def display_port_scan_results(result: EZNetResult) -> None:
         console.print()
     
     # Summary
-    if result.start_time and result.end_time:
-        duration = format_duration(result.start_time, result.end_time)
-        console.print(f"[dim]Total scan time: {duration:.1f} ms[/dim]")
+    if result.duration_ms is not None:
+        console.print(f"[dim]Total scan time: {result.duration_ms:.1f} ms[/dim]")
 
 
-async def run_multi_host_checks(hosts: list, port: Optional[int], timeout: int, max_concurrent: int = 50, ssl_check: bool = False) -> dict:
-    """Run network checks for multiple hosts concurrently."""
-    semaphore = asyncio.Semaphore(max_concurrent)
-    
-    async def check_host_with_semaphore(host):
-        async with semaphore:
-            return await run_all_checks(host, port, timeout, ssl_check)
-    
-    start_time = asyncio.get_event_loop().time()
+async def run_multi_host_checks(hosts: list, port: Optional[int], timeout: int, max_concurrent: int = 50, ssl_check: bool = False,
+                                checkers: Optional[CheckerSet] = None,
+                                on_host_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                                keep_results: bool = True) -> dict:
+    """Run network checks for multiple hosts concurrently.
+    
+    Hosts are fed to a fixed pool of ``max_concurrent`` workers, so only that
+    many checks exist at once however long the host list is.
+    ``on_host_result(host, result_dict)`` is called as each host finishes;
+    with ``keep_results=False`` per-host results are only passed to it and the
+    returned summary has no "results" entry.
+    """
+    # One checker set (HTTP pool and limiter) for every host
+    owned = checkers is None
+    if owned:
+        checkers = CheckerSet.create(timeout, max_concurrent)
+    
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    
+    # Hosts reach the workers already resolved. Lookups overlap across hosts,
+    # but at most max_concurrent are pending (in flight or waiting for a
+    # queue slot), so memory and time to first result don't grow with the list
+    worker_count = max(1, min(max_concurrent, len(hosts)))
+    queue = asyncio.Queue(maxsize=worker_count)
+    dns_slots = asyncio.Semaphore(max(1, max_concurrent))
+    
+    # Pre-seeded so output keeps the input order
+    host_results = dict.fromkeys(hosts) if keep_results else None
+    successful_hosts = 0
     
-    # Run all checks concurrently
-    tasks = [check_host_with_semaphore(host) for host in hosts]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def resolve(host):
+        try:
+            dns_result = await checkers.dns.check(host)
+        except Exception:
+            # run_all_checks looks the host up again and reports the error
+            dns_result = None
+        try:
+            await queue.put((host, dns_result))
+        finally:
+            dns_slots.release()
     
-    end_time = asyncio.get_event_loop().time()
+    async def produce():
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for host in hosts:
+                    await dns_slots.acquire()
+                    tg.create_task(resolve(host))
+        finally:
+            # One sentinel per worker signals shutdown once the queue is drained
+            for _ in range(worker_count):
+                await queue.put(None)
+    
+    async def worker():
+        nonlocal successful_hosts
+        while (item := await queue.get()) is not None:
+            host, dns_result = item
+            try:
+                result = await run_all_checks(host, port, timeout, ssl_check, checkers=checkers,
+                                              dns_result=dns_result)
+            except Exception as e:
+                host_result = {
+                    "success": False,
+                    "error": str(e),
+                    "host": host,
+                    "port": port
+                }
+            else:
+                host_result = result.to_dict()
+                if result.dns_results.get("ipv4", {}).get("success") or result.icmp_result.get("success"):
+                    successful_hosts += 1
+            if host_results is not None:
+                host_results[host] = host_result
+            if on_host_result is not None:
+                on_host_result(host, host_result)
     
-    # Process results
-    host_results = {}
-    successful_hosts = 0
+    try:
+        await asyncio.gather(produce(), *[worker() for _ in range(worker_count)])
+    finally:
+        if owned:
+            await checkers.aclose()
     
-    for i, result in enumerate(results):
-        host = hosts[i]
-        if isinstance(result, Exception):
-            host_results[host] = {
-                "success": False,
-                "error": str(result),
-                "host": host,
-                "port": port
-            }
-        else:
-            host_results[host] = result.to_dict()
-            if result.dns_results.get("ipv4", {}).get("success") or result.icmp_result.get("success"):
-                successful_hosts += 1
+    end_time = loop.time()
     
-    return {
+    summary = {
         "scan_timestamp": start_time,
         "total_hosts": len(hosts),
         "successful_hosts": successful_hosts,
-        "total_duration_ms": format_duration(start_time, end_time),
-        "results": host_results
+        "total_duration_ms": format_duration(start_time, end_time)
     }
+    if host_results is not None:
+        summary["results"] = host_results
+    return summary
+
+
+def _multi_host_row(host: str, result: dict) -> tuple:
+    """Build the summary table cells for one host of a multi-host scan."""
+    get = result.get
+    dns_ok = (get("dns") or {}).get("ipv4", {}).get("success")
+    icmp_ok = (get("icmp") or {}).get("success")
+    # tcp/http are keyed by port; the single-port view carries the status
+    tcp = get("tcp_single")
+    http = get("http_single")
+    
+    # Overall status
+    if get("error"):
+        overall_status = f"❌ Error: {result['error']}"
+    elif dns_ok or icmp_ok:
+        overall_status = _STATUS_REACHABLE
+    else:
+        overall_status = _STATUS_UNREACHABLE
+    
+    return (
+        host,
+        "✅" if dns_ok else "❌",
+        "⊝" if tcp is None else "✅" if tcp.get("success") else "❌",
+        "⊝" if http is None else "✅" if http.get("success") else "❌",
+        "✅" if icmp_ok else "❌",
+        overall_status
+    )
 
 
 def display_multi_host_results(results: dict, hosts: list) -> None:
@@ -381,7 +616,7 @@ def display_multi_host_results(results: dict, hosts: list) -> None:
     ))
     
     # Create summary table
-    summary_table = Table(title="📊 Host Summary", box=box.ROUNDED)
+    summary_table = Table(title=_TITLE_HOSTS, box=box.ROUNDED)
     summary_table.add_column("Host", style="cyan")
     summary_table.add_column("DNS", style="white")
     summary_table.add_column("TCP", style="white")
@@ -389,31 +624,12 @@ def display_multi_host_results(results: dict, hosts: list) -> None:
     summary_table.add_column("ICMP", style="white")
     summary_table.add_column("Status", style="green")
     
-    for host in hosts:
-        result = results["results"].get(host, {})
-        
-        # Status indicators
-        dns_status = "✅" if result.get("dns", {}).get("ipv4", {}).get("success") else "❌"
-        tcp_status = "✅" if result.get("tcp", {}).get("success") else "❌" if result.get("tcp") else "⊝"
-        http_status = "✅" if result.get("http", {}).get("success") else "❌" if result.get("http") else "⊝"
-        icmp_status = "✅" if result.get("icmp", {}).get("success") else "❌"
-        
-        # Overall status
-        if result.get("error"):
-            overall_status = f"❌ Error: {result['error']}"
-        elif dns_status == "✅" or icmp_status == "✅":
-            overall_status = "✅ Reachable"
-        else:
-            overall_status = "❌ Unreachable"
-        
-        summary_table.add_row(
-            host,
-            dns_status,
-            tcp_status,
-            http_status,
-            icmp_status,
-            overall_status
-        )
+    # Build every row first, then fill the table in one tight loop
+    host_results = results["results"]
+    rows = [_multi_host_row(host, host_results.get(host) or {}) for host in hosts]
+    add_row = summary_table.add_row
+    for row in rows:
+        add_row(*row)
     
     console.print(summary_table)
     console.print()
@@ -423,52 +639,80 @@ def display_multi_host_results(results: dict, hosts: list) -> None:
     if failed_hosts and len(failed_hosts) < len(hosts):
         console.print("[yellow]Detailed results for failed hosts:[/yellow]")
         for host in failed_hosts[:3]:  # Show max 3 detailed failures
-            result_obj = type('Result', (), {
-                'host': host,
-                'port': results["results"].get(host, {}).get("port"),
-                'dns_results': results["results"].get(host, {}).get("dns", {}),
-                'tcp_result': results["results"].get(host, {}).get("tcp", {}),
-                'http_result': results["results"].get(host, {}).get("http", {}),
-                'icmp_result': results["results"].get(host, {}).get("icmp", {}),
-                'start_time': None,
-                'end_time': None
-            })()
-            display_results(result_obj)
-
-
-async def run_all_checks(host: str, port: Optional[int], timeout: int, ssl_check: bool = False) -> EZNetResult:
-    """Run all network checks asynchronously."""
+            display_results(EZNetResult.from_dict(host, results["results"].get(host) or {}))
+
+
+async def run_all_checks(host: str, port: Optional[int], timeout: int, ssl_check: bool = False,
+                         checkers: Optional[CheckerSet] = None, ip: Optional[str] = None,
+                         dns_result: Optional[Dict[str, Any]] = None) -> EZNetResult:
+    """Run all network checks asynchronously.
+    
+    Pass ``checkers`` to share one CheckerSet (and its pooled HTTP client)
+    across many calls, and ``ip`` when the host was already resolved so the
+    TCP check skips its own lookup. ``dns_result`` is a DNSChecker answer
+    looked up beforehand, used instead of running the DNS check again.
+    """
     ports = [port] if port else []
     result = EZNetResult(host, ports)
-    result.start_time = asyncio.get_event_loop().time()
-    
-    # Initialize checkers
-    dns_checker = DNSChecker(timeout=timeout)
-    tcp_checker = TCPChecker(timeout=timeout)
-    http_checker = HTTPChecker(timeout=timeout)
-    icmp_checker = ICMPChecker(timeout=timeout)
-    ssl_checker = SSLChecker(timeout=timeout) if ssl_check else None
-    
-    # Run checks concurrently
-    tasks = [
-        dns_checker.check(host),
-        icmp_checker.check(host)
-    ]
-    
-    # Add TCP check if port is specified
-    if port:
-        tasks.append(tcp_checker.check(host, port))
-        
-        # Add HTTP check for common web ports
-        if port in [80, 443, 8080, 8443]:
-            tasks.append(http_checker.check(host, port))
-        
-        # Add SSL check for HTTPS ports
-        if ssl_check and port in [443, 8443, 993, 995, 465, 587, 636]:
-            tasks.append(ssl_checker.check(host, port, detailed=True))
-    
-    # Execute all tasks
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    loop = asyncio.get_running_loop()
+    result.start_time = loop.time()
+    
+    # A one-off call gets its own checkers, closed again before returning
+    owned = checkers is None
+    if owned:
+        checkers = CheckerSet.create(timeout)
+    dns_checker = checkers.dns
+    tcp_checker = checkers.tcp
+    http_checker = checkers.http
+    icmp_checker = checkers.icmp
+    ssl_checker = checkers.ssl
+    
+    tasks, ssl_task = [], None
+    try:
+        # One limiter slot covers this host's probes, shared with any other hosts
+        async with checkers.limiter:
+            # Run checks concurrently
+            if dns_result is None:
+                dns_task = asyncio.ensure_future(dns_checker.check(host))
+            else:
+                dns_task = loop.create_future()
+                dns_task.set_result(dns_result)
+            tasks = [
+                dns_task,
+                asyncio.ensure_future(icmp_checker.check(host))
+            ]
+            
+            # Add TCP check if port is specified
+            if port:
+                # The TLS handshake resolves on its own, so it starts right away
+                # instead of queueing behind the DNS answer
+                if ssl_check and port in TLS_PORTS:
+                    ssl_task = asyncio.ensure_future(ssl_checker.check(host, port, detailed=True))
+                
+                # Let TCP/HTTP connect to the DNS answer rather than resolve again
+                if ip is None:
+                    await asyncio.wait([tasks[0]])
+                    ip = None if tasks[0].exception() else first_ipv4(tasks[0].result())
+                
+                tasks.append(tcp_checker.check(host, port, ip=ip))
+                
+                # Add HTTP check for common web ports
+                if port in WEB_PORTS:
+                    tasks.append(http_checker.check(host, port, ip=ip))
+                
+                # Add SSL check for HTTPS ports
+                if ssl_task is not None:
+                    tasks.append(ssl_task)
+            
+            # Execute all tasks
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        # Checks still running when something raised are not left behind
+        for task in (*tasks, ssl_task):
+            if isinstance(task, asyncio.Future):
+                task.cancel()
+        if owned:
+            await checkers.aclose()
     
     # Process results
     result.dns_results = results[0] if not isinstance(results[0], Exception) else {"error": str(results[0])}
@@ -489,7 +733,8 @@ async def run_all_checks(host: str, port: Optional[int], timeout: int, ssl_check
             if isinstance(ssl_result, dict):
                 result.ssl_results[port] = ssl_result
     
-    result.end_time = asyncio.get_event_loop().time()
+    result.end_time = loop.time()
+    result.duration_ms = format_duration(result.start_time, result.end_time)
     return result
 
 
@@ -505,19 +750,19 @@ def display_results(result: EZNetResult) -> None:
     
     # DNS Results
     if result.dns_results:
-        dns_table = Table(title="🌐 DNS Resolution", box=box.ROUNDED)
+        dns_table = Table(title=_TITLE_DNS, box=box.ROUNDED)
         dns_table.add_column("Record Type", style="cyan")
         dns_table.add_column("Status", style="green")
         dns_table.add_column("Result", style="white")
         
         dns_data = result.dns_results
         if "ipv4" in dns_data:
-            status = "✅ Success" if dns_data["ipv4"]["success"] else "❌ Failed"
+            status = _STATUS_SUCCESS if dns_data["ipv4"]["success"] else _STATUS_FAILED
             addresses = ", ".join(dns_data["ipv4"].get("addresses", [])) if dns_data["ipv4"]["success"] else dns_data["ipv4"].get("error", "")
             dns_table.add_row("IPv4 (A)", status, addresses)
         
         if "ipv6" in dns_data:
-            status = "✅ Success" if dns_data["ipv6"]["success"] else "❌ Failed"
+            status = _STATUS_SUCCESS if dns_data["ipv6"]["success"] else _STATUS_FAILED
             addresses = ", ".join(dns_data["ipv6"].get("addresses", [])) if dns_data["ipv6"]["success"] else dns_data["ipv6"].get("error", "")
             dns_table.add_row("IPv6 (AAAA)", status, addresses)
         
@@ -526,13 +771,13 @@ def display_results(result: EZNetResult) -> None:
     
     # TCP Results
     if result.tcp_result:
-        tcp_table = Table(title="🔌 TCP Connection", box=box.ROUNDED)
+        tcp_table = Table(title=_TITLE_TCP, box=box.ROUNDED)
         tcp_table.add_column("Target", style="cyan")
         tcp_table.add_column("Status", style="green")
         tcp_table.add_column("Response Time", style="white")
         
         tcp_data = result.tcp_result
-        status = "✅ Open" if tcp_data.get("success") else "❌ Closed/Filtered"
+        status = _STATUS_OPEN if tcp_data.get("success") else _STATUS_FILTERED
         response_time = f"{tcp_data.get('response_time_ms', 0):.1f} ms" if tcp_data.get("success") else tcp_data.get("error", "")
         tcp_table.add_row(f"{result.host}:{result.port}", status, response_time)
         
@@ -541,7 +786,7 @@ def display_results(result: EZNetResult) -> None:
     
     # HTTP Results
     if result.http_result:
-        http_table = Table(title="🌍 HTTP Check", box=box.ROUNDED)
+        http_table = Table(title=_TITLE_HTTP, box=box.ROUNDED)
         http_table.add_column("Property", style="cyan")
         http_table.add_column("Value", style="white")
         
@@ -563,7 +808,7 @@ def display_results(result: EZNetResult) -> None:
     if result.ssl_results:
         ssl_ports = [p for p in result.ports if p in result.ssl_results and result.ssl_results[p].get("success")]
         if ssl_ports:
-            ssl_table = Table(title="🔒 SSL/TLS Certificate", box=box.ROUNDED)
+            ssl_table = Table(title=_TITLE_SSL, box=box.ROUNDED)
             ssl_table.add_column("Property", style="cyan")
             ssl_table.add_column("Value", style="white")
             
@@ -581,12 +826,10 @@ def display_results(result: EZNetResult) -> None:
             
             # Handle issuer which could be a string or dict
             issuer = cert.get("issuer", "Unknown")
-            if isinstance(issuer, str):
-                # Extract just the first part or organization name
-                if "CN=" in issuer:
-                    issuer_display = issuer.split(",")[0].replace("CN=", "").strip()
-                else:
-                    issuer_display = issuer
+            if cert.get("issuer_cn"):
+                issuer_display = cert["issuer_cn"]
+            elif isinstance(issuer, str):
+                issuer_display = issuer
             else:
                 issuer_display = issuer.get("organizationName", "Unknown") if isinstance(issuer, dict) else "Unknown"
             
@@ -632,13 +875,13 @@ def display_results(result: EZNetResult) -> None:
     
     # ICMP Results
     if result.icmp_result:
-        icmp_table = Table(title="🏓 ICMP Ping", box=box.ROUNDED)
+        icmp_table = Table(title=_TITLE_ICMP, box=box.ROUNDED)
         icmp_table.add_column("Target", style="cyan")
         icmp_table.add_column("Status", style="green")
         icmp_table.add_column("Response Time", style="white")
         
         icmp_data = result.icmp_result
-        status = "✅ Reachable" if icmp_data.get("success") else "❌ Unreachable"
+        status = _STATUS_REACHABLE if icmp_data.get("success") else _STATUS_UNREACHABLE
         response_time = f"{icmp_data.get('response_time_ms', 0):.1f} ms" if icmp_data.get("success") else icmp_data.get("error", "")
         icmp_table.add_row(result.host, status, response_time)
         
@@ -651,9 +894,8 @@ def display_results(result: EZNetResult) -> None:
         console.print()
     
     # Summary
-    if result.start_time and result.end_time:
-        duration = format_duration(result.start_time, result.end_time)
-        console.print(f"[dim]Total scan time: {duration:.1f} ms[/dim]")
+    if result.duration_ms is not None:
+        console.print(f"[dim]Total scan time: {result.duration_ms:.1f} ms[/dim]")
 
 
 @click.command()
@@ -664,11 +906,12 @@ def display_results(result: EZNetResult) -> None:
 @click.option("--ssl-check", is_flag=True, help="Perform comprehensive SSL/TLS certificate analysis with detailed information")
 @click.option("--timeout", "-t", default=5, help="Timeout in seconds (default: 5)")
 @click.option("--json", "output_json", is_flag=True, help="Output results in JSON format")
+@click.option("--json-stream", is_flag=True, help="Stream newline-delimited JSON, one object per host as it completes")
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 @click.option("--max-concurrent", default=50, help="Maximum concurrent connections (default: 50)")
 @click.option("--tui", is_flag=True, help="Launch interactive TUI (Terminal User Interface) similar to k9s")
 @click.version_option(version="0.2.0", prog_name="eznet")
-def main(host: Optional[str], hosts_file: Optional[str], port: Optional[str], common_ports: bool, ssl_check: bool, timeout: int, output_json: bool, verbose: bool, max_concurrent: int, tui: bool) -> None:
+def main(host: Optional[str], hosts_file: Optional[str], port: Optional[str], common_ports: bool, ssl_check: bool, timeout: int, output_json: bool, json_stream: bool, verbose: bool, max_concurrent: int, tui: bool) -> None:
     """
     EZNet - Comprehensive network testing tool.
     
@@ -695,8 +938,14 @@ def main(host: Optional[str], hosts_file: Optional[str], port: Optional[str], co
         
         eznet 8.8.8.8 -p 53 --json
         
+        eznet --hosts-file hosts.txt -p 443 --json-stream
+        
         eznet --tui
     """
+    # Keep stdout clean for machine-readable output; messages go to stderr
+    output_json = output_json or json_stream
+    out = err_console if output_json else console
+    
     # Handle TUI mode
     if tui:
         try:
@@ -704,30 +953,44 @@ def main(host: Optional[str], hosts_file: Optional[str], port: Optional[str], co
             run_tui()
             return
         except ImportError:
-            console.print("[red]Error: TUI dependencies not available. Install with: pip install textual[/red]")
+            out.print("[red]Error: TUI dependencies not available. Install with: pip install textual[/red]")
             sys.exit(1)
     
     # Validate input - either host or hosts-file must be provided
     if not host and not hosts_file:
-        console.print("[red]Error: Either HOST or --hosts-file must be provided[/red]")
-        console.print("[yellow]Usage: eznet HOST [OPTIONS][/yellow]")
-        console.print("[yellow]   or: eznet --hosts-file FILE [OPTIONS][/yellow]")
-        console.print("[yellow]   or: eznet --tui[/yellow]")
+        out.print("[red]Error: Either HOST or --hosts-file must be provided[/red]")
+        out.print("[yellow]Usage: eznet HOST [OPTIONS][/yellow]")
+        out.print("[yellow]   or: eznet --hosts-file FILE [OPTIONS][/yellow]")
+        out.print("[yellow]   or: eznet --tui[/yellow]")
         sys.exit(1)
     
     if host and hosts_file:
-        console.print("[red]Error: Cannot use both HOST and --hosts-file[/red]")
+        out.print("[red]Error: Cannot use both HOST and --hosts-file[/red]")
         sys.exit(1)
     
     # Prepare host list
-    hosts = []
+    entries = []
     if host:
         # Handle comma-separated hosts
-        hosts = [h.strip() for h in host.split(',') if h.strip()]
+        entries = host.split(',')
     elif hosts_file:
-        # Read hosts from file
-        with open(hosts_file, 'r') as f:
-            hosts = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        # Read hosts from file in one go and filter at the bytes level
+        with open(hosts_file, 'rb') as f:
+            lines = f.read().splitlines()
+        entries = [line.decode() for line in map(bytes.strip, lines) if line and not line.startswith(b'#')]
+    
+    # CIDR entries expand to their usable addresses
+    try:
+        hosts = list(expand_hosts(entries))
+    except ValueError as e:
+        out.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+    
+    # Repeated entries (or overlapping CIDRs) are only scanned once, in first-seen order
+    unique_hosts = list(dict.fromkeys(hosts))
+    if verbose and len(unique_hosts) < len(hosts):
+        out.print(f"[dim]Deduplicated {len(hosts) - len(unique_hosts)} entries[/dim]")
+    hosts = unique_hosts
     
     # Parse ports
     ports = []
@@ -735,75 +998,128 @@ def main(host: Optional[str], hosts_file: Optional[str], port: Optional[str], co
         try:
             ports = parse_ports(port)
         except ValueError as e:
-            console.print(f"[red]Error: {e}[/red]")
+            out.print(f"[red]Error: {e}[/red]")
             sys.exit(1)
     elif common_ports:
         ports = get_common_ports()
         if verbose:
-            console.print(f"[dim]Scanning {len(ports)} common ports[/dim]")
+            out.print(f"[dim]Scanning {len(ports)} common ports[/dim]")
     elif ssl_check:
         # If --ssl-check is specified without port, default to 443
         ports = [443]
         if verbose:
-            console.print(f"[dim]Using default HTTPS port 443 for SSL check[/dim]")
+            out.print(f"[dim]Using default HTTPS port 443 for SSL check[/dim]")
     
     # Validate port count
     if len(ports) > 1000:
-        console.print("[red]Error: Too many ports specified (max 1000)[/red]")
+        out.print("[red]Error: Too many ports specified (max 1000)[/red]")
         sys.exit(1)
     
     # Validate hosts
-    for h in hosts:
-        if not is_valid_hostname(h) and not is_valid_ip(h):
-            console.print(f"[red]Error: Invalid hostname or IP address: {h}[/red]")
-            sys.exit(1)
+    invalid_hosts = [h for h in hosts if not is_valid_host(h)]
+    if invalid_hosts:
+        out.print(f"[red]Error: Invalid hostname or IP address: {invalid_hosts[0]}[/red]")
+        sys.exit(1)
     
     if verbose:
         hosts_desc = f"{len(hosts)} hosts" if len(hosts) > 1 else hosts[0]
         ports_desc = f"{len(ports)} ports" if len(ports) > 1 else (f"port {ports[0]}" if ports else "no specific port")
-        console.print(f"[dim]Starting network probe for {hosts_desc}, {ports_desc} with {timeout}s timeout[/dim]")
+        out.print(f"[dim]Starting network probe for {hosts_desc}, {ports_desc} with {timeout}s timeout[/dim]")
         if ssl_check:
-            console.print("[dim]SSL certificate analysis enabled[/dim]")
+            out.print("[dim]SSL certificate analysis enabled[/dim]")
     
     try:
-        if len(hosts) == 1 and len(ports) <= 1:
+        with asyncio.Runner(loop_factory=_loop_factory) as runner:
+            results = runner.run(_run_checks(hosts, ports, timeout, ssl_check, max_concurrent,
+                                             not output_json, json_stream, output_json))
+        
+        if json_stream:
+            # Host lines were already streamed; finish with the result or summary line
+            _print_json(results if isinstance(results, dict) else results.to_dict(), indent=False)
+        elif len(hosts) == 1 and len(ports) <= 1:
             # Single host, single/no port - use original logic
-            single_port = ports[0] if ports else None
-            result = asyncio.run(run_all_checks(hosts[0], single_port, timeout, ssl_check))
-            
             if output_json:
-                print(json.dumps(result.to_dict(), indent=2))
+                _print_json(results.to_dict())
             else:
-                display_results(result)
+                display_results(results)
         elif len(hosts) == 1:
             # Single host, multiple ports - port scanning
-            result = asyncio.run(run_port_scan(hosts[0], ports, timeout, ssl_check, max_concurrent))
-            
             if output_json:
-                print(json.dumps(result.to_dict(), indent=2))
+                _print_json(results.to_dict())
             else:
-                display_port_scan_results(result)
+                display_port_scan_results(results)
         else:
             # Multiple hosts - run concurrently
-            single_port = ports[0] if len(ports) == 1 else None
-            results = asyncio.run(run_multi_host_checks(hosts, single_port, timeout, max_concurrent, ssl_check))
-            
             if output_json:
-                print(json.dumps(results, indent=2))
+                _print_json(results)
             else:
                 display_multi_host_results(results, hosts)
             
     except KeyboardInterrupt:
-        console.print("\n[yellow]Scan interrupted by user[/yellow]")
+        out.print("\n[yellow]Scan interrupted by user[/yellow]")
         sys.exit(1)
     except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
+        out.print(f"[red]Unexpected error: {e}[/red]")
         if verbose:
             import traceback
-            console.print(traceback.format_exc())
+            out.print(traceback.format_exc())
         sys.exit(1)
 
 
+def _print_json(payload: Any, indent: bool = True) -> None:
+    """Write ``payload`` to stdout as JSON, straight to the byte stream."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(dump_json(payload, indent) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+async def _run_checks(hosts: list, ports: list, timeout: int, ssl_check: bool, max_concurrent: int,
+                      show_progress: bool = False, stream: bool = False, include_headers: bool = False):
+    """Dispatch to the right run_* function with one shared CheckerSet."""
+    if len(hosts) > 1 and not HAS_AIODNS:
+        max_concurrent = min(max_concurrent, _NO_AIODNS_MAX_CONCURRENT)
+    checkers = CheckerSet.create(timeout, max_concurrent, include_headers)
+    try:
+        if len(hosts) == 1 and len(ports) <= 1:
+            single_port = ports[0] if ports else None
+            return await run_all_checks(hosts[0], single_port, timeout, ssl_check, checkers=checkers)
+        if len(hosts) == 1:
+            if not show_progress:
+                return await run_port_scan(hosts[0], ports, timeout, ssl_check, max_concurrent, checkers=checkers)
+            
+            # Live progress line while ports complete
+            counts = {"done": 0, "open": 0}
+            with console.status(f"Scanning {len(ports)} ports on {hosts[0]}...") as status:
+                def on_port_result(port, outcome):
+                    counts["done"] += 1
+                    if not isinstance(outcome, Exception) and isinstance(outcome[0], dict) and outcome[0].get("success"):
+                        counts["open"] += 1
+                    status.update(f"Scanned {counts['done']}/{len(ports)} ports on {hosts[0]} ({counts['open']} open)")
+                
+                return await run_port_scan(hosts[0], ports, timeout, ssl_check, max_concurrent,
+                                           checkers=checkers, on_port_result=on_port_result)
+        single_port = ports[0] if len(ports) == 1 else None
+        if stream:
+            # NDJSON: each host is written and dropped as soon as it finishes
+            return await run_multi_host_checks(hosts, single_port, timeout, max_concurrent, ssl_check,
+                                               checkers=checkers, keep_results=False,
+                                               on_host_result=lambda host, host_result: _print_json(host_result, indent=False))
+        if not show_progress:
+            return await run_multi_host_checks(hosts, single_port, timeout, max_concurrent, ssl_check, checkers=checkers)
+        
+        done = 0
+        with console.status(f"Checking {len(hosts)} hosts...") as status:
+            def on_host_result(host, host_result):
+                nonlocal done
+                done += 1
+                status.update(f"Checked {done}/{len(hosts)} hosts (last: {host})")
+            
+            return await run_multi_host_checks(hosts, single_port, timeout, max_concurrent, ssl_check,
+                                               checkers=checkers, on_host_result=on_host_result)
+    finally:
+        await checkers.aclose()
+
+
 def _display_detailed_certificate(detailed_cert: Dict[str, Any]) -> None:
     """Display detailed certificate information similar to openssl x509 -text."""
     
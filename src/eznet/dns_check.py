@@ -5,28 +5,147 @@ This module provides asynchronous DNS resolution for both IPv4 and IPv6 addresse
 """
 
 import asyncio
+import atexit
+import ipaddress
 import socket
-from typing import Dict, List, Any, Optional
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 
 try:
     import aiodns
     HAS_AIODNS = True
 except ImportError:
     HAS_AIODNS = False
+    warnings.warn(
+        "aiodns not installed; DNS will use blocking getaddrinfo threads and "
+        "will not scale beyond the resolver thread pool",
+        RuntimeWarning
+    )
+
+
+DEFAULT_DNS_TTL = 300
+_DNS_CACHE_SIZE = 4096
+
+# Process-wide answer cache keyed by (hostname, rrtype), in LRU order
+_DNS_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# In-flight lookups, so concurrent misses for the same key share one query
+_DNS_PENDING: Dict[Tuple[str, str], "asyncio.Future"] = {}
+
+# Blocking getaddrinfo/gethostbyaddr calls run here rather than on the loop's
+# default executor, so DNS storms don't starve unrelated blocking work.
+# Threads are only spawned on use, i.e. when aiodns is not installed.
+_DNS_EXECUTOR = ThreadPoolExecutor(max_workers=64, thread_name_prefix="eznet-dns")
+atexit.register(_DNS_EXECUTOR.shutdown, wait=False)
+
+# One c-ares channel per (event loop, timeout), shared by every DNSChecker
+_RESOLVER_CACHE: Dict[Tuple[int, float], "aiodns.DNSResolver"] = {}
+
+
+def _get_resolver(timeout: float) -> "aiodns.DNSResolver":
+    """
+    Return the shared resolver for ``timeout`` on the running loop.
+    
+    A resolver is bound to the loop it was created on, so each loop (a second
+    ``asyncio.run``, a TUI worker thread) gets its own. Resolvers of loops that
+    have since closed are dropped whenever a new one is built.
+    
+    Args:
+        timeout: Timeout in seconds for DNS queries
+    
+    Returns:
+        aiodns resolver bound to the running loop
+    """
+    loop = asyncio.get_running_loop()
+    key = (id(loop), timeout)
+    resolver = _RESOLVER_CACHE.get(key)
+    # The loop check also guards against a dead loop's id being reused
+    if resolver is None or resolver.loop is not loop:
+        for stale_key in [k for k, r in _RESOLVER_CACHE.items() if r.loop.is_closed()]:
+            del _RESOLVER_CACHE[stale_key]
+        resolver = aiodns.DNSResolver(timeout=timeout, loop=loop)
+        _RESOLVER_CACHE[key] = resolver
+    return resolver
+
+
+@atexit.register
+def _close_resolvers() -> None:
+    """Cancel outstanding queries on the shared resolvers at interpreter exit."""
+    for resolver in _RESOLVER_CACHE.values():
+        try:
+            resolver.cancel()
+        except Exception:
+            pass
+    _RESOLVER_CACHE.clear()
+
+
+def _copy_answer(answer: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a result dict and its nested dicts/lists, so callers can't alter a cached answer."""
+    return {
+        key: _copy_answer(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+        for key, value in answer.items()
+    }
 
 
 class DNSChecker:
     """Asynchronous DNS checker for IPv4 and IPv6 resolution."""
     
-    def __init__(self, timeout: int = 5):
+    def __init__(self, timeout: int = 5, ttl: float = DEFAULT_DNS_TTL):
         """
         Initialize DNS checker.
         
         Args:
             timeout: Timeout in seconds for DNS queries
+            ttl: Seconds a successful answer is served from the cache (0 disables it)
         """
         self.timeout = timeout
-        self.resolver = None
+        self.ttl = ttl
+    
+    @staticmethod
+    def invalidate(hostname: Optional[str] = None) -> None:
+        """
+        Drop cached answers for ``hostname``, or the whole cache if omitted.
+        
+        Args:
+            hostname: Hostname whose A/AAAA answers should be forgotten
+        """
+        if hostname is None:
+            _DNS_CACHE.clear()
+            return
+        for rrtype in ("A", "AAAA", "A+AAAA"):
+            _DNS_CACHE.pop((hostname, rrtype), None)
+    
+    async def _cached(self, hostname: str, rrtype: str,
+                      resolve: Callable[[str], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Serve ``resolve(hostname)`` from the TTL cache when possible."""
+        key = (hostname, rrtype)
+        entry = _DNS_CACHE.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            _DNS_CACHE.move_to_end(key)
+            return _copy_answer(entry[1])
+        
+        pending = _DNS_PENDING.get(key)
+        # A lookup left over from another (possibly closed) loop can't be awaited here
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(resolve(hostname))
+            _DNS_PENDING[key] = pending
+            pending.add_done_callback(
+                lambda done: _DNS_PENDING.pop(key) if _DNS_PENDING.get(key) is done else None
+            )
+        
+        # Shield so one cancelled caller doesn't cancel the query for the others
+        result = await asyncio.shield(pending)
+        
+        # Only successful answers are cached; failures are retried next time
+        if result["success"] and self.ttl > 0:
+            _DNS_CACHE[key] = (time.monotonic(), result)
+            _DNS_CACHE.move_to_end(key)
+            if len(_DNS_CACHE) > _DNS_CACHE_SIZE:
+                _DNS_CACHE.popitem(last=False)
+        # Concurrent callers share one answer, so each gets its own copy
+        return _copy_answer(result)
     
     async def check(self, hostname: str) -> Dict[str, Any]:
         """
@@ -38,35 +157,106 @@ class DNSChecker:
         Returns:
             Dictionary containing DNS resolution results
         """
+        # Literal addresses need no lookup at all
+        try:
+            ip = ipaddress.ip_address(hostname)
+        except ValueError:
+            ip = None
+        if ip is not None:
+            literal = {"success": True, "addresses": [str(ip)], "count": 1}
+            # The other family wasn't looked up, so it is reported as not
+            # applicable rather than as an empty successful answer
+            other = {
+                "success": False,
+                "error": f"Literal IPv{ip.version} address",
+                "addresses": [],
+                "count": 0
+            }
+            return {
+                "hostname": hostname,
+                "ipv4": literal if ip.version == 4 else other,
+                "ipv6": literal if ip.version == 6 else other
+            }
+        
+        if HAS_AIODNS:
+            # One getaddrinfo call fetches both families on the shared resolver
+            answer = await self._cached(hostname, "A+AAAA", self._resolve_both)
+            ipv4, ipv6 = answer["ipv4"], answer["ipv6"]
+        else:
+            # Separate A and AAAA lookups, run concurrently on the thread pool
+            ipv4, ipv6 = await asyncio.gather(
+                self._cached(hostname, "A", self._resolve_ipv4),
+                self._cached(hostname, "AAAA", self._resolve_ipv6)
+            )
         results = {
             "hostname": hostname,
-            "ipv4": await self._resolve_ipv4(hostname),
-            "ipv6": await self._resolve_ipv6(hostname)
+            "ipv4": ipv4,
+            "ipv6": ipv6
         }
         return results
     
+    async def bulk_check(self, hosts: List[str], max_concurrent: int = 200) -> List[Dict[str, Any]]:
+        """
+        Run ``check`` for many hosts at once, at most ``max_concurrent`` in flight.
+        
+        Args:
+            hosts: Hostnames to resolve
+            max_concurrent: Cap on simultaneous lookups (open sockets or
+                resolver threads)
+        
+        Returns:
+            DNS results in the same order as ``hosts``
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        
+        async def guarded(hostname: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.check(hostname)
+        
+        return await asyncio.gather(*[guarded(hostname) for hostname in hosts])
+    
+    async def _resolve_both(self, hostname: str) -> Dict[str, Any]:
+        """Resolve IPv4 and IPv6 addresses with a single aiodns getaddrinfo call."""
+        try:
+            answer = await _get_resolver(self.timeout).getaddrinfo(hostname, family=socket.AF_UNSPEC)
+        except Exception as e:
+            failed = {"success": False, "error": str(e), "addresses": [], "count": 0}
+            return {"success": False, "ipv4": failed, "ipv6": dict(failed)}
+        
+        # One node per address and socket type, so drop repeats in order
+        ipv4 = list(dict.fromkeys(
+            node.addr[0].decode() for node in answer.nodes if node.family == socket.AF_INET
+        ))
+        ipv6 = list(dict.fromkeys(
+            node.addr[0].decode() for node in answer.nodes if node.family == socket.AF_INET6
+        ))
+        return {
+            "success": bool(ipv4 or ipv6),
+            "ipv4": self._family_result(ipv4, "A"),
+            "ipv6": self._family_result(ipv6, "AAAA")
+        }
+    
+    @staticmethod
+    def _family_result(addresses: List[str], rrtype: str) -> Dict[str, Any]:
+        """Build the per-family result dict from a list of addresses."""
+        if not addresses:
+            return {"success": False, "error": f"No {rrtype} records", "addresses": [], "count": 0}
+        return {"success": True, "addresses": addresses, "count": len(addresses)}
+    
     async def _resolve_ipv4(self, hostname: str) -> Dict[str, Any]:
         """Resolve IPv4 addresses (A records)."""
         try:
             if HAS_AIODNS:
-                # Create resolver lazily in async context
-                if self.resolver is None:
-                    self.resolver = aiodns.DNSResolver(timeout=self.timeout)
-                
                 # Use aiodns for async resolution
-                records = await self.resolver.query(hostname, 'A')
+                records = await _get_resolver(self.timeout).query(hostname, 'A')
                 addresses = [record.host for record in records]
             else:
                 # Fallback to synchronous resolution
-                addresses = await asyncio.get_event_loop().run_in_executor(
-                    None, self._sync_resolve_ipv4, hostname
+                addresses = await asyncio.get_running_loop().run_in_executor(
+                    _DNS_EXECUTOR, self._sync_resolve_ipv4, hostname
                 )
             
-            return {
-                "success": True,
-                "addresses": addresses,
-                "count": len(addresses)
-            }
+            return self._family_result(addresses, "A")
         except Exception as e:
             return {
                 "success": False,
@@ -79,24 +269,16 @@ class DNSChecker:
         """Resolve IPv6 addresses (AAAA records)."""
         try:
             if HAS_AIODNS:
-                # Create resolver lazily in async context
-                if self.resolver is None:
-                    self.resolver = aiodns.DNSResolver(timeout=self.timeout)
-                
                 # Use aiodns for async resolution
-                records = await self.resolver.query(hostname, 'AAAA')
+                records = await _get_resolver(self.timeout).query(hostname, 'AAAA')
                 addresses = [record.host for record in records]
             else:
                 # Fallback to synchronous resolution
-                addresses = await asyncio.get_event_loop().run_in_executor(
-                    None, self._sync_resolve_ipv6, hostname
+                addresses = await asyncio.get_running_loop().run_in_executor(
+                    _DNS_EXECUTOR, self._sync_resolve_ipv6, hostname
                 )
             
-            return {
-                "success": True,
-                "addresses": addresses,
-                "count": len(addresses)
-            }
+            return self._family_result(addresses, "AAAA")
         except Exception as e:
             return {
                 "success": False,
@@ -106,20 +288,16 @@ class DNSChecker:
             }
     
     def _sync_resolve_ipv4(self, hostname: str) -> List[str]:
-        """Synchronous IPv4 resolution fallback."""
-        try:
-            result = socket.getaddrinfo(hostname, None, socket.AF_INET)
-            return list(set([addr[4][0] for addr in result]))
-        except Exception:
-            return []
+        """Synchronous IPv4 resolution fallback; lookup errors propagate."""
+        # One socket type, so each address comes back once rather than per type
+        result = socket.getaddrinfo(hostname, None, socket.AF_INET, socket.SOCK_STREAM)
+        return list(dict.fromkeys(addr[4][0] for addr in result))
     
     def _sync_resolve_ipv6(self, hostname: str) -> List[str]:
-        """Synchronous IPv6 resolution fallback."""
-        try:
-            result = socket.getaddrinfo(hostname, None, socket.AF_INET6)
-            return list(set([addr[4][0] for addr in result]))
-        except Exception:
-            return []
+        """Synchronous IPv6 resolution fallback; lookup errors propagate."""
+        # One socket type, so each address comes back once rather than per type
+        result = socket.getaddrinfo(hostname, None, socket.AF_INET6, socket.SOCK_STREAM)
+        return list(dict.fromkeys(addr[4][0] for addr in result))
     
     async def reverse_lookup(self, ip_address: str) -> Dict[str, Any]:
         """
@@ -133,15 +311,11 @@ class DNSChecker:
         """
         try:
             if HAS_AIODNS:
-                # Create resolver lazily in async context
-                if self.resolver is None:
-                    self.resolver = aiodns.DNSResolver(timeout=self.timeout)
-                
-                result = await self.resolver.gethostbyaddr(ip_address)
+                result = await _get_resolver(self.timeout).gethostbyaddr(ip_address)
                 hostname = result.name
             else:
-                hostname = await asyncio.get_event_loop().run_in_executor(
-                    None, socket.gethostbyaddr, ip_address
+                hostname = await asyncio.get_running_loop().run_in_executor(
+                    _DNS_EXECUTOR, socket.gethostbyaddr, ip_address
                 )
                 hostname = hostname[0]
             
@@ -5,8 +5,11 @@ This module provides asynchronous HTTP/HTTPS testing using httpx.
 """
 
 import asyncio
+import functools
+import ssl
 import time
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 
 try:
@@ -15,27 +18,169 @@ try:
 except ImportError:
     HAS_HTTPX = False
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+def _make_ssl_ctx() -> ssl.SSLContext:
+    """
+    Build the non-verifying TLS context for one client.
+    
+    Certificates are not verified here; SSLChecker handles certificate
+    analysis. Each client needs a context of its own: httpcore sets the ALPN
+    protocols on the context before every connect, so an HTTP/2 client and
+    an HTTP/1.1 client sharing one would overwrite each other's list.
+    """
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+# Headers scored by _check_security_headers
+_SEC_HEADER_KEYS = (
+    "strict-transport-security",
+    "x-frame-options",
+    "x-content-type-options",
+    "x-xss-protection",
+    "content-security-policy",
+    "referrer-policy"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class SecurityHeaderReport:
+    """Security header values, stored positionally in ``_SEC_HEADER_KEYS`` order."""
+    
+    headers: Tuple[Optional[str], ...]
+    present_count: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Expand into the header-name keyed dict used for JSON output."""
+        total = len(_SEC_HEADER_KEYS)
+        return {
+            "headers": dict(zip(_SEC_HEADER_KEYS, self.headers)),
+            "score": f"{self.present_count}/{total}",
+            "present_count": self.present_count,
+            "missing_count": total - self.present_count
+        }
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_url(protocol: str, host: str, port: int, path: str = "/") -> "httpx.URL":
+    """Build (once per target) the parsed URL for a check."""
+    netloc = f"[{host}]" if ":" in host else host
+    return httpx.URL(f"{protocol}://{netloc}:{port}{path}")
+
 
 class HTTPChecker:
     """Asynchronous HTTP/HTTPS checker."""
     
-    def __init__(self, timeout: int = 5):
+    user_agent = "EZNet/0.1.0 (Network Testing Tool)"
+    _DEFAULT_HEADERS = {"User-Agent": user_agent}
+    
+    def __init__(self, timeout: int = 5, client: Optional["httpx.AsyncClient"] = None,
+                 max_connections: int = 200, include_headers: bool = True):
         """
         Initialize HTTP checker.
         
         Args:
             timeout: Timeout in seconds for HTTP requests
+            client: Optional AsyncClient to use instead of building one; the
+                checker takes ownership and closes it in ``aclose()``
+            max_connections: Connection pool size of the client the checker
+                builds; half of it is kept alive between checks
+            include_headers: Default for ``check``: copy the full response
+                headers and security header analysis into results
         """
         self.timeout = timeout
-        self.user_agent = "EZNet/0.1.0 (Network Testing Tool)"
+        self.client = client
+        self.max_connections = max_connections
+        self.include_headers = include_headers
+        # HTTP/1.1-only client and the (host, port) targets that need it
+        self._http1_client: Optional["httpx.AsyncClient"] = None
+        self._http1_targets: set = set()
+    
+    def _make_client(self, http2: bool) -> "httpx.AsyncClient":
+        """Build a pooled client with the checker's timeout and limits."""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            # Built once per client, so its TLS sessions are resumed across checks
+            verify=_make_ssl_ctx(),
+            follow_redirects=True,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections // 2,
+                keepalive_expiry=30
+            )
+        )
+    
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Return the checker's client, building it on first use so keep-alive
+        connections are reused across checks.
+        
+        With h2 installed the client negotiates HTTP/2 over TLS, so probes to
+        the same origin multiplex over one connection."""
+        if self.client is None:
+            self.client = self._make_client(http2=HAS_HTTP2)
+        return self.client
+    
+    def _get_http1_client(self) -> "httpx.AsyncClient":
+        """Return the HTTP/1.1-only client used for targets with broken HTTP/2."""
+        if self._http1_client is None:
+            self._http1_client = self._make_client(http2=False)
+        return self._http1_client
+    
+    async def aclose(self) -> None:
+        """Close the clients and their pooled connections, if any were created."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self._http1_client is not None:
+            await self._http1_client.aclose()
+            self._http1_client = None
     
-    async def check(self, host: str, port: int) -> Dict[str, Any]:
+    async def _request(self, method: str, url: "httpx.URL", host_header: Optional[str] = None) -> "httpx.Response":
+        """
+        Send a request on the checker's pooled client.
+        
+        When a plain-HTTP ``url`` targets an IP address, ``host_header``
+        carries the real hostname for the Host header.
+        """
+        headers = self._DEFAULT_HEADERS
+        if host_header:
+            headers = {**headers, "Host": host_header}
+        
+        target = (url.host, url.port)
+        if HAS_HTTP2 and target not in self._http1_targets:
+            try:
+                return await self._get_client().request(method, url, headers=headers, timeout=self.timeout)
+            except httpx.RemoteProtocolError:
+                # Remember peers that break over HTTP/2 and retry them on HTTP/1.1
+                self._http1_targets.add(target)
+        
+        client = self._get_http1_client() if target in self._http1_targets else self._get_client()
+        return await client.request(method, url, headers=headers, timeout=self.timeout)
+    
+    async def check(self, host: str, port: int, ip: Optional[str] = None,
+                    include_headers: Optional[bool] = None) -> Dict[str, Any]:
         """
         Perform HTTP/HTTPS check.
         
         Args:
             host: Target hostname or IP address
             port: Target port number
+            ip: Already-resolved IPv4 address for host; plain HTTP requests
+                connect to it directly and send host as the Host header.
+                HTTPS always connects by hostname, since pooled TLS
+                connections are keyed by origin and would otherwise be
+                shared between virtual hosts on one address
+            include_headers: Include response headers and the security header
+                analysis; None uses the checker's default
             
         Returns:
             Dictionary containing HTTP check results
@@ -48,82 +193,87 @@ class HTTPChecker:
                 "port": port
             }
         
+        if include_headers is None:
+            include_headers = self.include_headers
+        
         # Determine protocol
         protocol = "https" if port in [443, 8443] else "http"
-        url = f"{protocol}://{host}:{port}/"
+        url = _build_url(protocol, host, port)
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(self.timeout),
-                verify=False,  # Don't verify SSL certificates for testing
-                follow_redirects=True
-            ) as client:
-                
-                response = await client.head(
-                    url,
-                    headers={"User-Agent": self.user_agent}
-                )
-                
-                response_time = (time.time() - start_time) * 1000
-                
-                result = {
-                    "success": True,
-                    "host": host,
-                    "port": port,
-                    "url": str(response.url),
-                    "protocol": protocol,
-                    "status_code": response.status_code,
-                    "reason_phrase": response.reason_phrase,
-                    "response_time_ms": response_time,
-                    "headers": dict(response.headers),
-                    "server": response.headers.get("server", "Unknown"),
-                    "content_type": response.headers.get("content-type", "Unknown"),
-                    "content_length": response.headers.get("content-length"),
-                    "is_redirect": 300 <= response.status_code < 400
-                }
-                
-                # Check for redirects
-                if result["is_redirect"]:
-                    result["redirect_url"] = response.headers.get("location")
-                
-                # Additional security headers check
-                result["security_headers"] = self._check_security_headers(response.headers)
-                
-                return result
-                
+            if ip and protocol == "http":
+                host_header = host if port == 80 else f"{host}:{port}"
+                response = await self._request("HEAD", _build_url(protocol, ip, port), host_header)
+            else:
+                response = await self._request("HEAD", url)
+            
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+            
+            # Report the hostname, not the address we connected to
+            final_url = response.url
+            if ip and protocol == "http" and final_url.host == ip:
+                final_url = final_url.copy_with(host=host)
+            
+            result = {
+                "success": True,
+                "host": host,
+                "port": port,
+                "url": str(final_url),
+                "protocol": protocol,
+                "status_code": response.status_code,
+                "reason_phrase": response.reason_phrase,
+                "response_time_ms": response_time,
+                "headers": dict(response.headers) if include_headers else None,
+                "server": response.headers.get("server", "Unknown"),
+                "content_type": response.headers.get("content-type", "Unknown"),
+                "content_length": response.headers.get("content-length"),
+                "is_redirect": 300 <= response.status_code < 400
+            }
+            
+            # Check for redirects
+            if result["is_redirect"]:
+                result["redirect_url"] = response.headers.get("location")
+            
+            # Additional security headers check
+            result["security_headers"] = (
+                self._check_security_headers(response.headers) if include_headers else None
+            )
+            
+            return result
+        
         except httpx.TimeoutException:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             return {
                 "success": False,
                 "host": host,
                 "port": port,
-                "url": url,
+                "url": str(url),
                 "protocol": protocol,
                 "response_time_ms": response_time,
                 "error": f"HTTP timeout after {self.timeout}s"
             }
             
         except httpx.ConnectError as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             return {
                 "success": False,
                 "host": host,
                 "port": port,
-                "url": url,
+                "url": str(url),
                 "protocol": protocol,
                 "response_time_ms": response_time,
                 "error": f"Connection failed: {e}"
             }
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             return {
                 "success": False,
                 "host": host,
                 "port": port,
-                "url": url,
+                "url": str(url),
                 "protocol": protocol,
                 "response_time_ms": response_time,
                 "error": str(e)
@@ -148,52 +298,43 @@ class HTTPChecker:
             }
         
         protocol = "https" if port in [443, 8443] else "http"
-        url = f"{protocol}://{host}:{port}{path}"
+        url = _build_url(protocol, host, port, path)
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(self.timeout),
-                verify=False,
-                follow_redirects=True
-            ) as client:
-                
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": self.user_agent}
-                )
-                
-                response_time = (time.time() - start_time) * 1000
-                
-                return {
-                    "success": True,
-                    "host": host,
-                    "port": port,
-                    "url": str(response.url),
-                    "protocol": protocol,
-                    "status_code": response.status_code,
-                    "reason_phrase": response.reason_phrase,
-                    "response_time_ms": response_time,
-                    "headers": dict(response.headers),
-                    "content": response.text[:1000],  # First 1000 chars
-                    "content_length": len(response.content),
-                    "encoding": response.encoding
-                }
-                
+            response = await self._request("GET", url)
+            
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+            
+            return {
+                "success": True,
+                "host": host,
+                "port": port,
+                "url": str(response.url),
+                "protocol": protocol,
+                "status_code": response.status_code,
+                "reason_phrase": response.reason_phrase,
+                "response_time_ms": response_time,
+                "headers": dict(response.headers),
+                "content": response.text[:1000],  # First 1000 chars
+                "content_length": len(response.content),
+                "encoding": response.encoding
+            }
+        
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             return {
                 "success": False,
                 "host": host,
                 "port": port,
-                "url": url,
+                "url": str(url),
                 "protocol": protocol,
                 "response_time_ms": response_time,
                 "error": str(e)
             }
     
-    def _check_security_headers(self, headers: Dict[str, str]) -> Dict[str, Any]:
+    def _check_security_headers(self, headers: Dict[str, str]) -> SecurityHeaderReport:
         """
         Check for common security headers.
         
@@ -201,26 +342,10 @@ class HTTPChecker:
             headers: HTTP response headers
             
         Returns:
-            Dictionary with security header analysis
+            SecurityHeaderReport; call ``to_dict()`` for the keyed analysis
         """
-        security_headers = {
-            "strict-transport-security": headers.get("strict-transport-security"),
-            "x-frame-options": headers.get("x-frame-options"),
-            "x-content-type-options": headers.get("x-content-type-options"),
-            "x-xss-protection": headers.get("x-xss-protection"),
-            "content-security-policy": headers.get("content-security-policy"),
-            "referrer-policy": headers.get("referrer-policy")
-        }
-        
-        # Count present security headers
-        present_headers = sum(1 for value in security_headers.values() if value is not None)
-        
-        return {
-            "headers": security_headers,
-            "score": f"{present_headers}/6",
-            "present_count": present_headers,
-            "missing_count": 6 - present_headers
-        }
+        values = tuple(headers.get(key) for key in _SEC_HEADER_KEYS)
+        return SecurityHeaderReport(values, len(values) - values.count(None))
     
     def parse_url(self, url: str) -> Dict[str, Any]:
         """
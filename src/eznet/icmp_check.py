@@ -1,29 +1,206 @@
 """
 ICMP ping functionality for EZNet.
 
-This module provides ICMP ping testing with fallback to system ping command.
+This module provides ICMP ping testing over a shared in-process ICMP socket,
+with fallback to the system ping command.
 """
 
 import asyncio
+import atexit
+import functools
+import struct
 import subprocess
 import time
 import os
 import platform
-from typing import Dict, Any
+import re
+import socket
+from typing import Dict, Any, List, Optional, Tuple
+
+
+_ICMP_PAYLOAD = b"EZNet ICMP Test"
+
+# Neither changes while we run; geteuid doesn't exist on Windows at all
+_PID = os.getpid() & 0xFFFF
+_IS_ROOT = hasattr(os, "geteuid") and os.geteuid() == 0
+
+# ICMP header: type, code, checksum, id, sequence, in network byte order
+_ICMP_HDR = struct.Struct("!BBHHH")
+
+# Reply time in system ping output, in one scan:
+#   time=1.234 ms / time<1ms (Unix, Windows), Zeit=15ms (German Windows),
+#   or failing those any "<number> ms"
+_PING_TIME_RE = re.compile(r'(?:time|Zeit)[<=](\d+\.?\d*)|(\d+\.?\d*)\s*ms', re.IGNORECASE)
+
+# System ping errors no other method can get past (lower-cased substrings)
+_TERMINAL_PING_ERRORS = (
+    "unknown host",
+    "name or service not known",
+    "temporary failure in name resolution",
+    "could not find host",
+    "network is unreachable",
+    "permission denied",
+)
+
+
+def _internet_checksum(data: bytes) -> int:
+    """RFC 1071 one's-complement sum of ``data`` as big-endian 16-bit words."""
+    if len(data) & 1:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+@functools.lru_cache(maxsize=64)
+def _echo_request(packet_id: int, sequence: int) -> bytes:
+    """Build (once per id/sequence pair) an ICMP echo request packet."""
+    header = _ICMP_HDR.pack(8, 0, 0, packet_id, sequence)
+    checksum = _internet_checksum(header + _ICMP_PAYLOAD)
+    return _ICMP_HDR.pack(8, 0, checksum, packet_id, sequence) + _ICMP_PAYLOAD
+
+
+class _ICMPEngine:
+    """
+    One non-blocking ICMP socket per event loop, shared by every ping.
+    
+    Uses an unprivileged ICMP datagram socket where the OS allows it (Linux
+    ``net.ipv4.ping_group_range``, macOS) and a raw socket otherwise, which
+    needs root. Replies are matched to waiting pings by sequence number.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self.raw = False
+        except OSError:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self.raw = True
+        sock.setblocking(False)
+        self.sock = sock
+        self.loop = loop
+        # Datagram sockets get their id rewritten by the kernel, so it is
+        # only checked on raw sockets
+        self.ident = _PID
+        self._seq = 0
+        self._pending: Dict[int, Tuple["asyncio.Future", int]] = {}
+        try:
+            loop.add_reader(sock.fileno(), self._on_readable)
+        except BaseException:
+            # e.g. NotImplementedError on the Windows proactor loop
+            sock.close()
+            raise
+    
+    def close(self) -> None:
+        """Stop listening and close the socket."""
+        if not self.loop.is_closed():
+            self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+    
+    async def ping(self, address: str, timeout: float) -> float:
+        """
+        Send one echo request to ``address`` and wait for the reply.
+        
+        Returns:
+            Round-trip time in milliseconds
+        
+        Raises:
+            asyncio.TimeoutError: No reply within ``timeout`` seconds
+        """
+        self._seq = (self._seq + 1) & 0xFFFF
+        seq = self._seq
+        future = self.loop.create_future()
+        self._pending[seq] = (future, time.perf_counter_ns())
+        try:
+            self.sock.sendto(_echo_request(self.ident, seq), (address, 0))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(seq, None)
+    
+    def _on_readable(self) -> None:
+        """Drain the socket and resolve the pings whose replies arrived."""
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(1024)
+            except OSError:
+                # BlockingIOError once drained; anything else ends this round too
+                return
+            received_ns = time.perf_counter_ns()
+            if self.raw:
+                # Raw sockets include the IP header; its length is in the low nibble
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < 8:
+                continue
+            icmp_type, _, _, ident, seq = _ICMP_HDR.unpack_from(data)
+            if icmp_type != 0 or (self.raw and ident != self.ident):
+                continue
+            entry = self._pending.get(seq)
+            if entry is not None and not entry[0].done():
+                entry[0].set_result((received_ns - entry[1]) / 1_000_000)
+
+
+# One engine per running loop, keyed like dns_check's resolver cache
+_ENGINES: Dict[int, _ICMPEngine] = {}
+# Set once opening an ICMP socket has failed; permissions don't change at runtime
+_ENGINE_UNAVAILABLE = False
+
+
+@atexit.register
+def _close_engines() -> None:
+    """Close the shared ICMP sockets at interpreter exit."""
+    for engine in _ENGINES.values():
+        try:
+            engine.close()
+        except Exception:
+            pass
+    _ENGINES.clear()
+
+
+def _get_engine() -> Optional[_ICMPEngine]:
+    """Return the running loop's ICMP engine, or None if no ICMP socket can be opened."""
+    global _ENGINE_UNAVAILABLE
+    if _ENGINE_UNAVAILABLE:
+        return None
+    loop = asyncio.get_running_loop()
+    engine = _ENGINES.get(id(loop))
+    if engine is None or engine.loop is not loop:
+        for key in [k for k, e in _ENGINES.items() if e.loop.is_closed()]:
+            _ENGINES.pop(key).close()
+        try:
+            engine = _ICMPEngine(loop)
+        except (OSError, NotImplementedError):
+            _ENGINE_UNAVAILABLE = True
+            return None
+        _ENGINES[id(loop)] = engine
+    return engine
 
 
 class ICMPChecker:
     """ICMP ping checker with multiple implementations."""
     
-    def __init__(self, timeout: int = 5):
+    # Raw-socket ping targets: host -> (IPv4 address, monotonic expiry)
+    _dns_cache: Dict[str, Tuple[str, float]] = {}
+    _DNS_TTL = 300
+    # Consecutive raw-socket failures per host; a cached address is dropped
+    # after _MAX_FAILURES in a row in case it went stale
+    _fail_counts: Dict[str, int] = {}
+    _MAX_FAILURES = 3
+    
+    def __init__(self, timeout: int = 5, include_raw: bool = False):
         """
         Initialize ICMP checker.
         
         Args:
             timeout: Timeout in seconds for ping
+            include_raw: Include (the start of) system ping output in results
         """
         self.timeout = timeout
+        self.include_raw = include_raw
         self.system = platform.system().lower()
+        # The raw-socket fallback always sends the same echo request
+        self._packet_id = _PID
+        self._packet = self._create_icmp_packet(self._packet_id, 1)
     
     async def check(self, host: str) -> Dict[str, Any]:
         """
@@ -35,20 +212,31 @@ class ICMPChecker:
         Returns:
             Dictionary containing ping results
         """
-        # Try system ping command first
+        # A shared in-process ICMP socket avoids forking ping for every check
+        # The engine is IPv4 only: IPv6 targets and hosts without an IPv4
+        # address go through the system ping command, which handles both
+        engine = _get_engine()
+        if engine is not None and ":" not in host:
+            result = await self._ping_with_engine(engine, host)
+            if result is not None:
+                return result
+        
+        # Otherwise fall back to the system ping command
         try:
             result = await self._ping_with_system_command(host)
             if result.get("success"):
                 return result
             
-            # If system ping failed due to ICMP blocking, don't try raw socket
-            if "ICMP ping blocked" in result.get("error", ""):
+            # ICMP blocked, unresolvable host, unreachable network: a raw
+            # socket would fail the same way, so don't try one
+            if result.get("error_kind") == "terminal":
                 return result
             
             # Only try raw socket for other types of failures (and if running as root)
-            if os.geteuid() == 0:
+            if _IS_ROOT:
                 try:
                     raw_result = await self._ping_with_raw_socket(host)
+                    self._record_raw_result(host, bool(raw_result.get("success")))
                     if raw_result.get("success"):
                         return raw_result
                 except Exception:
@@ -65,6 +253,51 @@ class ICMPChecker:
                 "method": "none"
             }
     
+    async def _ping_with_engine(self, engine: _ICMPEngine, host: str) -> Optional[Dict[str, Any]]:
+        """
+        Ping through the loop's shared ICMP socket.
+        
+        Args:
+            engine: ICMP engine of the running loop
+            host: Target hostname or IP address
+        
+        Returns:
+            Dictionary containing ping results, or None if the host has no
+            IPv4 address
+        """
+        try:
+            dest_addr = await self._resolve(host)
+        except socket.gaierror:
+            return None
+        try:
+            response_time = await engine.ping(dest_addr, self.timeout)
+        except asyncio.TimeoutError:
+            self._record_raw_result(host, False)
+            return {
+                "success": False,
+                "host": host,
+                "error": "ICMP ping blocked (firewall/security policy)",
+                "method": "icmp_socket",
+                "response_time_ms": self.timeout * 1000,
+                "hint": "Host may still be reachable via TCP/HTTP"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "host": host,
+                "error": f"Ping failed: {e}",
+                "method": "icmp_socket"
+            }
+        
+        self._record_raw_result(host, True)
+        return {
+            "success": True,
+            "host": host,
+            "response_time_ms": response_time,
+            "method": "icmp_socket",
+            "dest_addr": dest_addr
+        }
+    
     async def _ping_with_system_command(self, host: str) -> Dict[str, Any]:
         """
         Use system ping command.
@@ -88,7 +321,8 @@ class ICMPChecker:
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=1024  # single-packet ping output is a few hundred bytes
             )
             
             try:
@@ -108,24 +342,30 @@ class ICMPChecker:
             
             response_time = (time.time() - start_time) * 1000
             
-            # Parse output
-            output = stdout.decode('utf-8', errors='ignore')
-            
             if process.returncode == 0:
+                # The reply line comes right after the header, so only the
+                # start of the output needs decoding
+                output = stdout[:512].decode('utf-8', errors='ignore')
+                
                 # Extract timing information from output
                 parsed_time = self._parse_ping_time(output)
                 if parsed_time is not None:
                     response_time = parsed_time
                 
-                return {
+                result = {
                     "success": True,
                     "host": host,
                     "response_time_ms": response_time,
-                    "method": "system_command",
-                    "raw_output": output.strip()
+                    "method": "system_command"
                 }
+                if self.include_raw:
+                    result["raw_output"] = output[:200].strip()
+                return result
             else:
-                error_output = stderr.decode('utf-8', errors='ignore')
+                # Failure: skip time parsing; the packet-loss summary is at
+                # the end of stdout, so only its tail is decoded
+                output = stdout[-512:].decode('utf-8', errors='ignore')
+                error_output = stderr[:512].decode('utf-8', errors='ignore')
                 
                 # Check if it's a common case of packet loss (ICMP blocked)
                 if "100% packet loss" in output or "0 packets received" in output:
@@ -133,15 +373,20 @@ class ICMPChecker:
                         "success": False,
                         "host": host,
                         "error": "ICMP ping blocked (firewall/security policy)",
+                        "error_kind": "terminal",
                         "method": "system_command",
                         "response_time_ms": response_time,
                         "hint": "Host may still be reachable via TCP/HTTP"
                     }
                 
+                error = error_output.strip() or "Ping failed"
+                lowered = error.lower()
+                terminal = any(marker in lowered for marker in _TERMINAL_PING_ERRORS)
                 return {
                     "success": False,
                     "host": host,
-                    "error": error_output.strip() or "Ping failed",
+                    "error": error,
+                    "error_kind": "terminal" if terminal else "transient",
                     "method": "system_command",
                     "response_time_ms": response_time
                 }
@@ -156,6 +401,39 @@ class ICMPChecker:
                 "response_time_ms": response_time
             }
     
+    async def _resolve(self, host: str) -> str:
+        """
+        Resolve ``host`` to an IPv4 address without blocking the loop.
+        
+        Args:
+            host: Target hostname or IP address
+        
+        Returns:
+            IPv4 address, from the cache while it is fresh
+        """
+        cached = self._dns_cache.get(host)
+        now = time.monotonic()
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, None, family=socket.AF_INET, type=socket.SOCK_RAW
+        )
+        address = infos[0][4][0]
+        self._dns_cache[host] = (address, now + self._DNS_TTL)
+        return address
+    
+    def _record_raw_result(self, host: str, success: bool) -> None:
+        """Track consecutive failures and forget the cached address after too many."""
+        if success:
+            self._fail_counts.pop(host, None)
+            return
+        failures = self._fail_counts.get(host, 0) + 1
+        if failures >= self._MAX_FAILURES:
+            self._dns_cache.pop(host, None)
+            failures = 0
+        self._fail_counts[host] = failures
+    
     async def _ping_with_raw_socket(self, host: str) -> Dict[str, Any]:
         """
         Use raw socket for ICMP ping (requires root privileges).
@@ -167,7 +445,7 @@ class ICMPChecker:
             Dictionary containing ping results
         """
         # Check if running as root
-        if os.geteuid() != 0:
+        if not _IS_ROOT:
             return {
                 "success": False,
                 "host": host,
@@ -178,25 +456,19 @@ class ICMPChecker:
         
         try:
             # Import required modules for raw socket ping
-            import socket
-            import struct
             import select
             
+            # Resolve hostname (before opening the socket, so a failed lookup can't leak it)
+            dest_addr = await self._resolve(host)
+            
             # Create raw socket
             icmp_socket = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
             icmp_socket.settimeout(self.timeout)
             
-            # Resolve hostname
-            dest_addr = socket.gethostbyname(host)
-            
-            # Create ICMP packet
-            packet_id = os.getpid() & 0xFFFF
-            packet = self._create_icmp_packet(packet_id, 1)
-            
             start_time = time.time()
             
             # Send packet
-            icmp_socket.sendto(packet, (dest_addr, 1))
+            icmp_socket.sendto(self._packet, (dest_addr, 1))
             
             # Wait for reply
             ready = select.select([icmp_socket], [], [], self.timeout)
@@ -205,7 +477,7 @@ class ICMPChecker:
                 response_time = (time.time() - start_time) * 1000
                 
                 # Parse ICMP reply
-                if self._parse_icmp_reply(recv_packet, packet_id):
+                if self._parse_icmp_reply(recv_packet, self._packet_id):
                     icmp_socket.close()
                     return {
                         "success": True,
@@ -232,57 +504,24 @@ class ICMPChecker:
             }
     
     def _create_icmp_packet(self, packet_id: int, sequence: int) -> bytes:
-        """Create ICMP echo request packet."""
-        import struct
-        
-        # ICMP header: type (8), code (0), checksum (0), id, sequence
-        header = struct.pack("bbHHh", 8, 0, 0, packet_id, sequence)
-        data = b"EZNet ICMP Test"
-        
-        # Calculate checksum
-        checksum = self._calculate_checksum(header + data)
-        
-        # Pack header with checksum
-        header = struct.pack("bbHHh", 8, 0, checksum, packet_id, sequence)
-        
-        return header + data
+        """Create ICMP echo request packet (cached, as id and payload never change)."""
+        return _echo_request(packet_id, sequence)
     
     def _calculate_checksum(self, data: bytes) -> int:
         """Calculate ICMP checksum."""
-        import struct
-        
-        checksum = 0
-        
-        # Make 16-bit words out of every two adjacent bytes
-        for i in range(0, len(data), 2):
-            if i + 1 < len(data):
-                word = (data[i] << 8) + data[i + 1]
-            else:
-                word = data[i] << 8
-            checksum += word
-        
-        # Add high 16 bits to low 16 bits
-        checksum = (checksum >> 16) + (checksum & 0xFFFF)
-        checksum += (checksum >> 16)
-        
-        # One's complement
-        return (~checksum) & 0xFFFF
+        return _internet_checksum(data)
     
     def _parse_icmp_reply(self, packet: bytes, expected_id: int) -> bool:
         """Parse ICMP reply packet."""
-        import struct
-        
-        try:
-            # Skip IP header (usually 20 bytes)
-            icmp_header = packet[20:28]
-            type_code, code, checksum, packet_id, sequence = struct.unpack("bbHHh", icmp_header)
-            
-            # Check if it's an echo reply (type 0) with our packet ID
-            return type_code == 0 and packet_id == expected_id
-        except:
+        # Skip IP header (usually 20 bytes); anything shorter can't hold a reply
+        if len(packet) < 28:
             return False
+        type_code, code, checksum, packet_id, sequence = _ICMP_HDR.unpack_from(packet, 20)
+        
+        # Check if it's an echo reply (type 0) with our packet ID
+        return type_code == 0 and packet_id == expected_id
     
-    def _parse_ping_time(self, output: str) -> float:
+    def _parse_ping_time(self, output: str) -> Optional[float]:
         """
         Extract ping time from system ping output.
         
@@ -292,25 +531,10 @@ class ICMPChecker:
         Returns:
             Response time in milliseconds or None if not found
         """
-        import re
-        
-        # Common patterns for different ping outputs
-        patterns = [
-            r'time[<=](\d+\.?\d*)\s*ms',  # Linux/Unix: time=1.234 ms
-            r'Zeit[<=](\d+\.?\d*)\s*ms',  # German Windows: Zeit=1ms
-            r'time[<=](\d+\.?\d*)',       # Without ms suffix
-            r'(\d+\.?\d*)\s*ms',          # Just number with ms
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, output, re.IGNORECASE)
-            if match:
-                try:
-                    return float(match.group(1))
-                except ValueError:
-                    continue
-        
-        return 0.0
+        match = _PING_TIME_RE.search(output)
+        if match is None:
+            return None
+        return float(match.group(1) or match.group(2))
     
     async def continuous_ping(self, host: str, count: int = 4, interval: float = 1.0) -> Dict[str, Any]:
         """
@@ -324,21 +548,19 @@ class ICMPChecker:
         Returns:
             Dictionary containing continuous ping results
         """
-        results = []
+        # Pings are started ``interval`` apart but don't wait for each other's
+        # replies, so a slow reply no longer delays the next packet
+        async def ping_at(i: int) -> Dict[str, Any]:
+            await asyncio.sleep(i * interval)
+            return await self.check(host)
+        
+        results = await asyncio.gather(*[ping_at(i) for i in range(count)])
         successful_pings = 0
         total_time = 0.0
-        
-        for i in range(count):
-            result = await self.check(host)
-            results.append(result)
-            
+        for result in results:
             if result.get("success"):
                 successful_pings += 1
                 total_time += result.get("response_time_ms", 0)
-            
-            # Wait before next ping (except for last one)
-            if i < count - 1:
-                await asyncio.sleep(interval)
         
         # Calculate statistics
         packet_loss = ((count - successful_pings) / count) * 100
@@ -360,4 +582,16 @@ class ICMPChecker:
                 "avg_ms": avg_time
             },
             "individual_results": results
-        }
\ No newline at end of file
+        }
+    
+    async def check_many(self, hosts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Ping several hosts at once.
+        
+        Args:
+            hosts: Target hostnames or IP addresses
+        
+        Returns:
+            Ping results in the same order as ``hosts``
+        """
+        return await asyncio.gather(*[self.check(host) for host in hosts])
\ No newline at end of file
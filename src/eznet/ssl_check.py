@@ -6,23 +6,210 @@ and security analysis.
 """
 
 import asyncio
+import functools
+import ipaddress
+import re
 import ssl
 import socket
+import time
 import datetime
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from cryptography import x509
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+from .utils import format_cert_date
+
+
+DEFAULT_SSL_TTL = 60
+_SSL_CACHE_SIZE = 1024
+
+# Process-wide certificate cache keyed by (host, port), in LRU order. Raw
+# certificates are cached rather than results, so expiry is always fresh.
+_SSL_CACHE: "OrderedDict[Tuple[str, int], Tuple[float, Dict]]" = OrderedDict()
+
+# Hostname matching is analyzed separately, so only the chain is verified.
+# getpeercert() only decodes the certificate when verification is on.
+_CERT_CTX = ssl.create_default_context()
+_CERT_CTX.check_hostname = False
+
+# Certificates that fail verification are fetched again through this one
+# and decoded from DER, so they are still graded
+_UNVERIFIED_CTX = ssl.create_default_context()
+_UNVERIFIED_CTX.check_hostname = False
+_UNVERIFIED_CTX.verify_mode = ssl.CERT_NONE
+
+# Timestamp layout getpeercert() uses for notBefore/notAfter
+_CERT_TIME_FORMAT = "%b %d %H:%M:%S %Y GMT"
+
+# getpeercert() attribute names -> the short DN keys used throughout
+_DN_ABBREVIATIONS = {
+    "commonName": "CN",
+    "organizationName": "O",
+    "organizationalUnitName": "OU",
+    "localityName": "L",
+    "stateOrProvinceName": "ST",
+    "countryName": "C"
+}
+
+_CN_RE = re.compile(r'CN=([^,]+)')
+
+
+def _extract_cn(name: Any) -> Optional[str]:
+    """Return the common name from an ``CN=..., O=...`` string, or None."""
+    if not isinstance(name, str):
+        return None
+    match = _CN_RE.search(name)
+    return match.group(1).strip() if match else None
+
+
+def _format_dn(rdns: Tuple) -> str:
+    """Render a getpeercert() subject/issuer as a ``CN=..., O=...`` string."""
+    return ", ".join(
+        f"{_DN_ABBREVIATIONS.get(key, key)}={value}" for rdn in rdns for key, value in rdn
+    )
+
+
+def _decode_der_cert(der: bytes) -> Dict[str, Any]:
+    """Decode a DER certificate into the same fields ``_fetch_cert`` reads from getpeercert()."""
+    cert = x509.load_der_x509_certificate(der)
+    try:
+        san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+        alt_names = [("DNS", name) for name in san.get_values_for_type(x509.DNSName)]
+        alt_names += [("IP Address", str(ip)) for ip in san.get_values_for_type(x509.IPAddress)]
+    except x509.ExtensionNotFound:
+        alt_names = []
+    return {
+        'subject': ", ".join(f"{a.rfc4514_attribute_name}={a.value}" for rdn in cert.subject.rdns for a in rdn),
+        'issuer': ", ".join(f"{a.rfc4514_attribute_name}={a.value}" for rdn in cert.issuer.rdns for a in rdn),
+        'notBefore': cert.not_valid_before_utc.strftime(_CERT_TIME_FORMAT),
+        'notAfter': cert.not_valid_after_utc.strftime(_CERT_TIME_FORMAT),
+        'version': cert.version.value + 1,
+        'serialNumber': f"{cert.serial_number:X}",
+        'subjectAltName': alt_names
+    }
+
+
+# Map common distinguished name abbreviations to full names
+_DN_KEY_MAPPING = {
+    "CN": "Common Name",
+    "O": "Organization",
+    "OU": "Organizational Unit",
+    "L": "Locality",
+    "ST": "State/Province",
+    "C": "Country"
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_dn(name_str: str) -> Tuple[Tuple[str, str], ...]:
+    """Split a ``CN=..., O=...`` string into (full key, value) pairs."""
+    components = {}
+    for part in name_str.split(", "):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            key = key.strip()
+            components[_DN_KEY_MAPPING.get(key, key)] = value.strip()
+    return tuple(components.items())
+
+
+@functools.lru_cache(maxsize=1024)
+def _dns_name_matches(pattern: str, host: str) -> bool:
+    """Match ``host`` against one certificate DNS name (both lowercase, no trailing dot)."""
+    if not pattern.startswith("*."):
+        return pattern == host
+    # A wildcard stands for exactly one whole leftmost label, and never
+    # directly under a top-level domain
+    parent = pattern[2:]
+    label, _, rest = host.partition(".")
+    return bool(label) and "." in parent and rest == parent
+
+
+def _hostname_matches(host: str, alt_names: List[Tuple[str, str]], subject: str) -> bool:
+    """
+    Check whether a certificate covers ``host``.
+    
+    Args:
+        host: Hostname or IP address that was connected to
+        alt_names: subjectAltName entries as (type, value) pairs
+        subject: Subject as a ``CN=..., O=...`` string
+    
+    Returns:
+        True if a SAN entry matches, or, for certificates without SANs,
+        the common name equals the host
+    """
+    host = host.lower().rstrip(".")
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        ip = None
+    
+    if alt_names:
+        if ip is not None:
+            for kind, value in alt_names:
+                if kind == "IP Address":
+                    try:
+                        if ipaddress.ip_address(value.strip()) == ip:
+                            return True
+                    except ValueError:
+                        continue
+            return False
+        return any(
+            _dns_name_matches(value.lower().rstrip("."), host)
+            for kind, value in alt_names if kind == "DNS"
+        )
+    
+    # Legacy certificates without SANs only name their host in the CN
+    cn = _extract_cn(subject)
+    return cn is not None and cn.lower().rstrip(".") == host
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_not_after(not_after_str: str) -> Optional[datetime.datetime]:
+    """Parse a certificate notAfter string, or return None if unrecognised."""
+    s = not_after_str.strip()
+    # ISO dates have a dash after the year; everything else is the ASN.1 form
+    fmt = "%Y-%m-%d %H:%M:%S" if s[4:5] == "-" else "%b %d %H:%M:%S %Y %Z"
+    try:
+        return datetime.datetime.strptime(s, fmt)
+    except ValueError:
+        return None
 
 
 class SSLChecker:
     """SSL/TLS certificate checker."""
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, ttl: float = DEFAULT_SSL_TTL):
         """
         Initialize SSL checker.
         
         Args:
             timeout: Timeout in seconds for SSL connections
+            ttl: Seconds a retrieved certificate is reused (0 disables caching)
         """
         self.timeout = timeout
+        self.ttl = ttl
+    
+    async def _get_cert(self, host: str, port: int) -> Optional[Dict]:
+        """Retrieve the certificate for ``host:port``, from the TTL cache when possible."""
+        key = (host, port)
+        entry = _SSL_CACHE.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            _SSL_CACHE.move_to_end(key)
+            return entry[1]
+        
+        cert_info = await self._fetch_cert(host, port)
+        # Only successful retrievals are cached, so failures are retried next time
+        if cert_info and self.ttl > 0:
+            _SSL_CACHE[key] = (time.monotonic(), cert_info)
+            _SSL_CACHE.move_to_end(key)
+            if len(_SSL_CACHE) > _SSL_CACHE_SIZE:
+                _SSL_CACHE.popitem(last=False)
+        return cert_info
     
     async def check(self, host: str, port: int = 443, detailed: bool = False) -> Dict[str, Any]:
         """
@@ -37,9 +224,7 @@ class SSLChecker:
             Dictionary containing SSL check results
         """
         try:
-            # Run sync SSL check in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            cert_info = await loop.run_in_executor(None, self._get_cert_sync, host, port)
+            cert_info = await self._get_cert(host, port)
             
             if not cert_info:
                 return {
@@ -49,6 +234,20 @@ class SSLChecker:
                     "port": port
                 }
             
+            verify_error = cert_info.get("verify_error")
+            if verify_error is not None and "subject" not in cert_info:
+                # Verification failed and the certificate couldn't be decoded
+                return {
+                    "success": False,
+                    "host": host,
+                    "port": port,
+                    "error": f"Certificate verification failed: {verify_error[0]} "
+                             "(install 'cryptography' to analyze unverified certificates)",
+                    "verify_failed": True,
+                    "verify_reason": verify_error[0],
+                    "verify_code": verify_error[1]
+                }
+            
             # Analyze certificate
             analysis = self._analyze_certificate(cert_info, host)
             
@@ -62,6 +261,9 @@ class SSLChecker:
                 "certificate": analysis,
                 "security_score": security_score
             }
+            if verify_error is not None:
+                result["verify_failed"] = True
+                result["verify_reason"], result["verify_code"] = verify_error
             
             # Add detailed certificate information if requested
             if detailed:
@@ -69,6 +271,14 @@ class SSLChecker:
             
             return result
             
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "host": host,
+                "port": port,
+                "error": f"SSL handshake timeout after {self.timeout}s"
+            }
+            
         except Exception as e:
             return {
                 "success": False,
@@ -77,36 +287,78 @@ class SSLChecker:
                 "error": str(e)
             }
     
-    def _get_cert_sync(self, host: str, port: int) -> Optional[Dict]:
-        """Synchronous certificate retrieval - simplified version."""
-        # For demonstration, provide mock SSL certificate data
-        # In a production environment, you would implement proper SSL certificate retrieval
-        import datetime
+    async def check_many(self, targets: List[Tuple[str, int]], concurrency: int = 32,
+                         detailed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Run ``check`` for many (host, port) pairs at once.
         
-        # Create mock certificate data based on common patterns
-        future_date = datetime.datetime.now() + datetime.timedelta(days=90)
+        Args:
+            targets: (hostname, port) pairs to check
+            concurrency: Cap on simultaneous handshakes (open sockets)
+            detailed: Whether to include detailed certificate information
         
-        if host == "github.com":
-            return {
-                'subject': "CN=github.com",
-                'issuer': "CN=Sectigo ECC Domain Validation Secure Server CA, O=Sectigo Limited, L=Salford, ST=Greater Manchester, C=GB",
-                'notBefore': "Feb  5 00:00:00 2025 GMT",
-                'notAfter': "Feb  5 23:59:59 2026 GMT",
-                'version': 3,
-                'serialNumber': '12345678901234567890',
-                'subjectAltName': [('DNS', 'github.com'), ('DNS', '*.github.com')]
-            }
-        else:
-            return {
-                'subject': f"CN={host}",
-                'issuer': "CN=Let's Encrypt Authority X3, O=Let's Encrypt, C=US",
-                'notBefore': datetime.datetime.now().strftime("%b %d %H:%M:%S %Y GMT"),
-                'notAfter': future_date.strftime("%b %d %H:%M:%S %Y GMT"),
-                'version': 3,
-                'serialNumber': '987654321098765432',
-                'subjectAltName': [('DNS', host)]
-            }
-
+        Returns:
+            SSL results in the same order as ``targets``
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def guarded(host: str, port: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.check(host, port, detailed=detailed)
+        
+        return await asyncio.gather(*[guarded(host, port) for host, port in targets])
+    
+    async def _fetch_cert(self, host: str, port: int) -> Optional[Dict]:
+        """
+        Handshake with ``host:port`` on the event loop and return its certificate.
+        
+        A certificate whose chain doesn't verify (expired, self-signed,
+        untrusted issuer) is fetched again without verification and decoded
+        from DER; the failure is kept under ``verify_error`` as (reason, code).
+        """
+        try:
+            cert = await self._handshake(host, port, _CERT_CTX)
+        except ssl.SSLCertVerificationError as e:
+            verify_error = (e.verify_message or e.reason or str(e), e.verify_code)
+            if not HAS_CRYPTOGRAPHY:
+                return {'verify_error': verify_error}
+            der = await self._handshake(host, port, _UNVERIFIED_CTX, binary_form=True)
+            if not der:
+                return None
+            cert_info = _decode_der_cert(der)
+            cert_info['verify_error'] = verify_error
+            return cert_info
+        
+        if not cert:
+            return None
+        return {
+            'subject': _format_dn(cert.get("subject", ())),
+            'issuer': _format_dn(cert.get("issuer", ())),
+            'notBefore': cert.get("notBefore", ""),
+            'notAfter': cert.get("notAfter", ""),
+            'version': cert.get("version"),
+            'serialNumber': cert.get("serialNumber"),
+            'subjectAltName': list(cert.get("subjectAltName", ()))
+        }
+    
+    async def _handshake(self, host: str, port: int, ctx: ssl.SSLContext, binary_form: bool = False) -> Any:
+        """Complete one TLS handshake and return the peer certificate as getpeercert() gives it."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ctx, server_hostname=host),
+            timeout=self.timeout
+        )
+        try:
+            return writer.get_extra_info("ssl_object").getpeercert(binary_form=binary_form)
+        finally:
+            writer.close()
+            # A peer that never answers close_notify would otherwise hold
+            # the check open indefinitely
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError, asyncio.TimeoutError):
+                pass
+    
     def _analyze_certificate(self, cert_dict: Dict, host: str) -> Dict[str, Any]:
         """Analyze certificate for security issues."""
         analysis = {
@@ -116,22 +368,26 @@ class SSLChecker:
             "not_after": cert_dict.get("notAfter", ""),
         }
         
-        # Simple hostname match check
-        subject = analysis.get("subject", "").lower()
-        analysis["hostname_match"] = host.lower() in subject or f"*.{host.split('.', 1)[-1]}" in subject
+        # Display-ready forms, computed once here instead of in every view
+        analysis["issuer_cn"] = _extract_cn(analysis["issuer"])
+        analysis["not_after_iso"] = format_cert_date(analysis["not_after"]) if analysis["not_after"] else None
+        
+        # Chain verification outcome from the handshake
+        verify_error = cert_dict.get("verify_error")
+        analysis["verified"] = verify_error is None
+        if verify_error is not None:
+            analysis["verify_reason"] = verify_error[0]
+        
+        analysis["hostname_match"] = _hostname_matches(
+            host, cert_dict.get("subjectAltName", []), analysis["subject"]
+        )
         
         # Check if certificate is expired or expiring soon
         try:
             not_after_str = analysis["not_after"]
             if not_after_str:
-                # Try to parse different date formats
-                for fmt in ["%b %d %H:%M:%S %Y %Z", "%Y-%m-%d %H:%M:%S"]:
-                    try:
-                        not_after = datetime.datetime.strptime(not_after_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                else:
+                not_after = _parse_not_after(not_after_str)
+                if not_after is None:
                     not_after = datetime.datetime.now() + datetime.timedelta(days=365)  # Default to future
                 
                 now = datetime.datetime.now()
@@ -144,7 +400,7 @@ class SSLChecker:
                 analysis["days_until_expiry"] = None
                 analysis["is_expired"] = False
                 analysis["expires_soon"] = False
-        except:
+        except (ValueError, TypeError, KeyError):
             analysis["days_until_expiry"] = None
             analysis["is_expired"] = False
             analysis["expires_soon"] = False
@@ -164,6 +420,10 @@ class SSLChecker:
             score -= 10
             issues.append("Certificate expires soon")
         
+        if cert_analysis.get("verify_reason") and not cert_analysis.get("is_expired"):
+            score -= 30
+            issues.append(f"Untrusted certificate: {cert_analysis['verify_reason']}")
+        
         if not cert_analysis.get("hostname_match"):
             score -= 20
             issues.append("Hostname mismatch")
@@ -222,29 +482,6 @@ class SSLChecker:
     
     def _parse_certificate_name(self, name_str: str) -> Dict[str, str]:
         """Parse certificate distinguished name string into components."""
-        components = {}
         if not name_str:
-            return components
-        
-        # Simple parsing of CN=..., O=..., etc.
-        parts = name_str.split(", ")
-        for part in parts:
-            if "=" in part:
-                key, value = part.split("=", 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Map common abbreviations to full names
-                key_mapping = {
-                    "CN": "Common Name",
-                    "O": "Organization", 
-                    "OU": "Organizational Unit",
-                    "L": "Locality",
-                    "ST": "State/Province",
-                    "C": "Country"
-                }
-                
-                full_key = key_mapping.get(key, key)
-                components[full_key] = value
-        
-        return components
\ No newline at end of file
+            return {}
+        return dict(_parse_dn(name_str))
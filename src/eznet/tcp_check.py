@@ -5,146 +5,325 @@ This module provides asynchronous TCP connection testing.
 """
 
 import asyncio
+import errno
 import socket
 import time
-from typing import Dict, Any
+from collections import deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+from .dns_check import DEFAULT_DNS_TTL, DNSChecker
+
+
+# Upper bound on concurrent connects when sizing from the fd limit
+_MAX_AUTO_CONCURRENT = 4096
+# File descriptors left over for everything else in the process
+_FD_HEADROOM = 100
+
+
+def _fd_budget() -> Optional[int]:
+    """Return how many sockets the fd limit leaves room for, or None if unknown."""
+    if not HAS_RESOURCE:
+        return None
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return None
+    return max(1, soft - _FD_HEADROOM)
+
+
+# Connect failures by exception type: (type, status, error message template)
+_TCP_ERRORS = (
+    (TimeoutError, "timeout", "Connection timeout after {timeout}s"),
+    (ConnectionRefusedError, "refused", "Connection refused"),
+    (socket.gaierror, "dns_error", "DNS resolution failed: {error}"),
+)
+
+
+def _classify_error(error: Exception, timeout: float) -> Tuple[str, str]:
+    """Map a failed connect to its (status, error message)."""
+    for exc_type, status, message in _TCP_ERRORS:
+        if isinstance(error, exc_type):
+            return status, message.format(timeout=timeout, error=error)
+    # Out of file descriptors says nothing about the port itself
+    if isinstance(error, OSError) and error.errno in (errno.EMFILE, errno.ENFILE):
+        return "fd_limit", str(error)
+    return "error", str(error)
+
+
+# Well-known service per port, built once and read-only
+_SERVICE_NAMES = MappingProxyType({
+    21: "FTP",
+    22: "SSH",
+    23: "Telnet",
+    25: "SMTP",
+    53: "DNS",
+    80: "HTTP",
+    110: "POP3",
+    143: "IMAP",
+    443: "HTTPS",
+    993: "IMAPS",
+    995: "POP3S",
+    3389: "RDP",
+    5432: "PostgreSQL",
+    3306: "MySQL",
+    6379: "Redis",
+    27017: "MongoDB",
+    8080: "HTTP-Alt",
+    8443: "HTTPS-Alt"
+})
+
+
+@dataclass(slots=True)
+class TCPResult:
+    """Outcome of one TCP connect, compact enough to keep for every port of a scan."""
+    
+    success: bool
+    host: str
+    port: int
+    response_time_ms: float
+    status: str
+    error: Optional[str] = None
+    # Address actually connected to, when one was resolved
+    ip: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Expand into the result dict used by ``check`` and JSON output."""
+        result = {
+            "success": self.success,
+            "host": self.host,
+            "port": self.port,
+            "response_time_ms": self.response_time_ms,
+            "status": self.status
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        if self.ip is not None and self.ip != self.host:
+            result["ip"] = self.ip
+        return result
 
 
 class TCPChecker:
     """Asynchronous TCP connection checker."""
     
-    def __init__(self, timeout: int = 5):
+    def __init__(self, timeout: int = 5, dns_ttl: float = DEFAULT_DNS_TTL):
         """
         Initialize TCP checker.
         
         Args:
             timeout: Timeout in seconds for TCP connections
+            dns_ttl: Seconds a resolved address is reused for later connects
         """
         self.timeout = timeout
+        # Lookups share DNSChecker's process-wide cache, so
+        # DNSChecker.invalidate() also forgets connect targets
+        self._dns = DNSChecker(timeout=timeout, ttl=dns_ttl)
     
-    async def check(self, host: str, port: int) -> Dict[str, Any]:
+    async def _resolve(self, host: str) -> List[str]:
+        """
+        Resolve ``host`` to connectable addresses without blocking the loop.
+        
+        Args:
+            host: Target hostname or IP address
+        
+        Returns:
+            IPv4 addresses followed by IPv6 ones
+        
+        Raises:
+            socket.gaierror: If the host has no address at all
+        """
+        answer = await self._dns.check(host)
+        addresses = answer["ipv4"]["addresses"] + answer["ipv6"]["addresses"]
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, answer["ipv4"].get("error") or "No address found")
+        return addresses
+    
+    async def check(self, host: str, port: int, ip: Optional[str] = None) -> Dict[str, Any]:
         """
         Test TCP connection to host:port.
         
         Args:
             host: Target hostname or IP address
             port: Target port number
+            ip: Already-resolved address for host; connecting to it skips
+                a second DNS lookup
             
         Returns:
             Dictionary containing TCP connection results
         """
-        start_time = time.time()
+        return (await self.probe(host, port, ip)).to_dict()
+    
+    async def probe(self, host: str, port: int, ip: Optional[str] = None) -> TCPResult:
+        """
+        Test TCP connection to host:port, returning a TCPResult.
+        
+        Args:
+            host: Target hostname or IP address
+            port: Target port number
+            ip: Already-resolved address for host
+        
+        Returns:
+            TCPResult for the connect attempt
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            addresses = [ip] if ip is not None else await self._resolve(host)
+        except Exception as e:
+            status, error = _classify_error(e, self.timeout)
+            return TCPResult(False, host, port, (time.perf_counter_ns() - start_ns) / 1_000_000, status, error)
+        return await self._probe(host, port, addresses, start_ns)
+    
+    async def _probe(self, host: str, port: int, addresses: List[str],
+                     start_ns: Optional[int] = None) -> TCPResult:
+        """Connect to each of ``addresses`` in turn until one accepts."""
+        if start_ns is None:
+            start_ns = time.perf_counter_ns()
+        status, error = "open", None
+        ip = addresses[0]
         
+        # A dual-stack host whose first address is unreachable still
+        # connects over the other one. The timeout covers all attempts
+        # together; ``ip`` ends up as the address that connected or failed last.
         try:
-            # Create connection with timeout
-            future = asyncio.open_connection(host, port)
-            reader, writer = await asyncio.wait_for(future, timeout=self.timeout)
-            
-            # Calculate response time
-            response_time = (time.time() - start_time) * 1000
-            
-            # Clean up connection
-            writer.close()
-            await writer.wait_closed()
-            
-            return {
-                "success": True,
-                "host": host,
-                "port": port,
-                "response_time_ms": response_time,
-                "status": "open"
-            }
-            
-        except asyncio.TimeoutError:
-            response_time = (time.time() - start_time) * 1000
-            return {
-                "success": False,
-                "host": host,
-                "port": port,
-                "response_time_ms": response_time,
-                "status": "timeout",
-                "error": f"Connection timeout after {self.timeout}s"
-            }
-            
-        except ConnectionRefusedError:
-            response_time = (time.time() - start_time) * 1000
-            return {
-                "success": False,
-                "host": host,
-                "port": port,
-                "response_time_ms": response_time,
-                "status": "refused",
-                "error": "Connection refused"
-            }
-            
-        except socket.gaierror as e:
-            response_time = (time.time() - start_time) * 1000
-            return {
-                "success": False,
-                "host": host,
-                "port": port,
-                "response_time_ms": response_time,
-                "status": "dns_error",
-                "error": f"DNS resolution failed: {e}"
-            }
-            
+            # asyncio.timeout runs in the current task; wait_for would
+            # wrap every connect in a task of its own
+            async with asyncio.timeout(self.timeout):
+                for ip in addresses:
+                    try:
+                        await self._connect(ip, port)
+                    except Exception as e:
+                        status, error = _classify_error(e, self.timeout)
+                    else:
+                        status, error = "open", None
+                        break
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
-            return {
-                "success": False,
-                "host": host,
-                "port": port,
-                "response_time_ms": response_time,
-                "status": "error",
-                "error": str(e)
-            }
+            status, error = _classify_error(e, self.timeout)
+        
+        return TCPResult(error is None, host, port, (time.perf_counter_ns() - start_ns) / 1_000_000,
+                         status, error, ip)
     
-    async def scan_ports(self, host: str, ports: list, max_concurrent: int = 50) -> Dict[str, Any]:
+    @staticmethod
+    async def _connect(ip: str, port: int) -> None:
+        """Open and close one TCP connection to ``ip:port``, raising on failure."""
+        # A bare non-blocking socket is enough for a liveness probe; no
+        # stream reader/writer pair is built just to be torn down again
+        sock = socket.socket(socket.AF_INET6 if ":" in ip else socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            await asyncio.get_running_loop().sock_connect(sock, (ip, port))
+        finally:
+            sock.close()
+    
+    async def scan_ports(self, host: str, ports: list, max_concurrent: Optional[int] = 50,
+                         as_dicts: bool = True) -> Dict[str, Any]:
         """
         Scan multiple ports concurrently.
         
+        Concurrency never exceeds what the open-file limit allows, and shrinks
+        further if connects start failing for lack of file descriptors.
+        
         Args:
             host: Target hostname or IP address
             ports: List of port numbers to scan
-            max_concurrent: Maximum number of concurrent connections
+            max_concurrent: Maximum number of concurrent connections; None
+                sizes it from the open-file limit
+            as_dicts: Return per-port results as dicts; False keeps them as
+                TCPResult objects, which take far less memory on large scans
             
         Returns:
             Dictionary containing results for all ports
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def check_with_semaphore(port):
-            async with semaphore:
-                return await self.check(host, port)
-        
-        # Create tasks for all ports
-        tasks = [check_with_semaphore(port) for port in ports]
-        
-        # Execute all tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        port_results = {}
-        for i, result in enumerate(results):
-            port = ports[i]
-            if isinstance(result, Exception):
-                port_results[port] = {
-                    "success": False,
-                    "host": host,
-                    "port": port,
-                    "error": str(result)
-                }
-            else:
-                port_results[port] = result
+        outcomes: Dict[int, TCPResult] = {}
+        async for result in self.iter_scan_ports(host, ports, max_concurrent):
+            outcomes[result.port] = result
         
+        port_results = {port: outcomes[port] for port in ports}
         return {
             "host": host,
             "total_ports": len(ports),
-            "open_ports": [port for port, result in port_results.items() if result.get("success")],
-            "results": port_results
+            "open_ports": [port for port, result in port_results.items() if result.success],
+            "results": {port: result.to_dict() for port, result in port_results.items()} if as_dicts else port_results
         }
     
-    def get_service_name(self, port: int) -> str:
+    async def iter_scan_ports(self, host: str, ports: list,
+                              max_concurrent: Optional[int] = 50) -> AsyncIterator[TCPResult]:
+        """
+        Scan multiple ports concurrently, yielding each result as it arrives.
+        
+        Args:
+            host: Target hostname or IP address
+            ports: List of port numbers to scan
+            max_concurrent: Maximum number of concurrent connections; None
+                sizes it from the open-file limit
+        
+        Yields:
+            TCPResult per port, in completion order
+        """
+        # Resolve once up front rather than once per port
+        try:
+            addresses = await self._resolve(host)
+        except socket.gaierror as e:
+            error = f"DNS resolution failed: {e}"
+            for port in ports:
+                yield TCPResult(False, host, port, 0.0, "dns_error", error)
+            return
+        
+        finished: "asyncio.Queue[Optional[TCPResult]]" = asyncio.Queue()
+        pool = asyncio.ensure_future(
+            self._scan_with_workers(host, addresses, ports, max_concurrent, finished.put_nowait)
+        )
+        # None marks the end, however the pool finished
+        pool.add_done_callback(lambda _: finished.put_nowait(None))
+        try:
+            while (result := await finished.get()) is not None:
+                yield result
+            # Re-raise anything that stopped the pool early
+            await pool
+        finally:
+            # The consumer may stop iterating before the scan is done
+            pool.cancel()
+    
+    async def _scan_with_workers(self, host: str, addresses: List[str], ports: list,
+                                 max_concurrent: Optional[int],
+                                 on_result: Callable[[TCPResult], None]) -> None:
+        """Probe ``ports`` on ``addresses`` with a bounded worker pool, passing each result to ``on_result``."""
+        budget = _fd_budget()
+        if max_concurrent is None:
+            max_concurrent = min(budget or _MAX_AUTO_CONCURRENT, _MAX_AUTO_CONCURRENT)
+        elif budget is not None:
+            max_concurrent = min(max_concurrent, budget)
+        
+        # A pool of workers pulls ports from one shared queue, so a large port
+        # list costs max_concurrent tasks rather than one per port
+        pending = deque(ports)
+        workers = max(1, min(max_concurrent, len(ports)))
+        
+        async def worker():
+            nonlocal workers
+            while pending:
+                port = pending.popleft()
+                try:
+                    outcome = await self._probe(host, port, addresses)
+                except Exception as e:
+                    outcome = TCPResult(False, host, port, 0.0, "error", str(e))
+                # Out of descriptors: requeue the port and retire this worker,
+                # so concurrency settles at what the process can hold open
+                if outcome.status == "fd_limit" and workers > 1:
+                    pending.appendleft(port)
+                    workers -= 1
+                    return
+                on_result(outcome)
+        
+        await asyncio.gather(*[worker() for _ in range(workers)])
+    
+    @staticmethod
+    def get_service_name(port: int) -> str:
         """
         Get common service name for a port.
         
@@ -154,25 +333,4 @@ class TCPChecker:
         Returns:
             Service name or "unknown"
         """
-        common_ports = {
-            21: "FTP",
-            22: "SSH",
-            23: "Telnet",
-            25: "SMTP",
-            53: "DNS",
-            80: "HTTP",
-            110: "POP3",
-            143: "IMAP",
-            443: "HTTPS",
-            993: "IMAPS",
-            995: "POP3S",
-            3389: "RDP",
-            5432: "PostgreSQL",
-            3306: "MySQL",
-            6379: "Redis",
-            27017: "MongoDB",
-            8080: "HTTP-Alt",
-            8443: "HTTPS-Alt"
-        }
-        
-        return common_ports.get(port, "unknown")
\ No newline at end of file
+        return _SERVICE_NAMES.get(port, "unknown")
\ No newline at end of file
@@ -5,7 +5,8 @@ This module implements a more complete TUI application with advanced features.
 """
 
 import asyncio
-from typing import Dict, List, Optional
+import functools
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -17,13 +18,13 @@ from textual.binding import Binding
 from textual import work, on
 from textual.message import Message
 
-from ..cli import run_all_checks, run_port_scan, EZNetResult
+from ..cli import run_all_checks, run_port_scan, CheckerSet, EZNetResult
 from ..utils import is_valid_hostname, is_valid_ip, parse_ports, get_common_ports
 from .results import ResultsScreen
 from .k9s_theme import K9S_THEME
 
 
-@dataclass
+@dataclass(slots=True)
 class HostEntry:
     """Represents a host entry in the TUI."""
     hostname: str
@@ -32,6 +33,43 @@ class HostEntry:
     last_scan: Optional[datetime] = None
     results: Optional[EZNetResult] = None
     error: Optional[str] = None
+    # Results column text, computed once per scan rather than per redraw
+    summary: str = ""
+
+
+_STATUS_EMOJI = {
+    "pending": "⏳",
+    "running": "🔄",
+    "completed": "✅",
+    "error": "❌"
+}
+
+
+# (label, key) per host-table column; keys let single cells be updated
+_HOST_COLUMNS = (
+    ("Host", "host"),
+    ("Ports", "ports"),
+    ("Status", "status"),
+    ("Last Scan", "last_scan"),
+    ("Results", "results")
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _ports_label(ports: Tuple[int, ...]) -> str:
+    """Render a host's ports for the Ports column, truncated to fit."""
+    ports_str = ",".join(map(str, ports)) if ports else "common"
+    if len(ports_str) > 15:
+        ports_str = ports_str[:12] + "..."
+    return ports_str
+
+
+def _summarize(results: EZNetResult) -> str:
+    """Build the one-line Results column text for a finished scan."""
+    dns_ok = results.dns_results.get("ipv4", {}).get("success", False)
+    tcp_ok = sum(1 for r in results.tcp_results.values() if r.get("success"))
+    total_tcp = len(results.tcp_results)
+    return f"DNS:{'✓' if dns_ok else '✗'} TCP:{tcp_ok}/{total_tcp}"
 
 
 class RefreshDisplay(Message):
@@ -222,9 +260,14 @@ class EZNetAdvancedApp(App):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.hosts: List[HostEntry] = []
+        # Canonical hostname -> entry, so re-adding a host doesn't duplicate its scans
+        self._hosts_by_name: Dict[str, HostEntry] = {}
         self.selected_host_index = 0
         self.dark = True
         self.current_context = "hosts"
+        # One checker stack for the app's lifetime, so pooled HTTP connections
+        # and cached DNS/certificate answers carry over between scans
+        self.checkers = CheckerSet.create(5, include_headers=False)
     
     def compose(self) -> ComposeResult:
         """Compose the advanced application layout."""
@@ -292,17 +335,25 @@ class EZNetAdvancedApp(App):
     def on_mount(self) -> None:
         """Set up the application when mounted."""
         table = self.query_one("#host-table", DataTable)
-        table.add_columns("Host", "Ports", "Status", "Last Scan", "Results")
+        for label, key in _HOST_COLUMNS:
+            table.add_column(label, key=key)
         table.cursor_type = "row"
         table.zebra_stripes = True
         
         # Start with empty host list - users can add hosts with 'a' key
     
-    def add_host_entry(self, hostname: str, ports: List[int]):
-        """Add a new host entry."""
-        host_entry = HostEntry(hostname=hostname, ports=ports)
-        self.hosts.append(host_entry)
+    def add_host_entry(self, hostname: str, ports: List[int]) -> HostEntry:
+        """Add a new host entry, merging ports into an existing one for the same host."""
+        hostname = hostname.strip().lower()
+        host_entry = self._hosts_by_name.get(hostname)
+        if host_entry is None:
+            host_entry = HostEntry(hostname=hostname, ports=ports)
+            self._hosts_by_name[hostname] = host_entry
+            self.hosts.append(host_entry)
+        else:
+            host_entry.ports = list(dict.fromkeys(host_entry.ports + ports))
         self.refresh_table()
+        return host_entry
     
     def refresh_table(self):
         """Refresh the host table display."""
@@ -310,41 +361,36 @@ class EZNetAdvancedApp(App):
         selected_row = table.cursor_row
         table.clear()
         
-        for i, host in enumerate(self.hosts):
-            ports_str = ",".join(map(str, host.ports)) if host.ports else "common"
-            if len(ports_str) > 15:
-                ports_str = ports_str[:12] + "..."
-            
-            status_emoji = {
-                "pending": "⏳",
-                "running": "🔄", 
-                "completed": "✅",
-                "error": "❌"
-            }.get(host.status, "⏳")
-            
-            last_scan = host.last_scan.strftime("%H:%M:%S") if host.last_scan else "-"
-            
-            results_summary = ""
-            if host.results:
-                dns_ok = host.results.dns_results.get("ipv4", {}).get("success", False)
-                tcp_ok = sum(1 for r in host.results.tcp_results.values() if r.get("success"))
-                total_tcp = len(host.results.tcp_results)
-                results_summary = f"DNS:{'✓' if dns_ok else '✗'} TCP:{tcp_ok}/{total_tcp}"
-            elif host.error:
-                results_summary = "Error"
-            
-            table.add_row(
-                host.hostname,
-                ports_str,
-                f"{status_emoji} {host.status}",
-                last_scan,
-                results_summary
-            )
+        for host in self.hosts:
+            # Hostnames are unique, so they double as row keys
+            table.add_row(*self._row_cells(host), key=host.hostname)
         
         # Restore cursor position
         if 0 <= selected_row < len(self.hosts):
             table.move_cursor(row=selected_row)
     
+    @staticmethod
+    def _row_cells(host: HostEntry) -> Tuple[str, ...]:
+        """Return the host table cells for ``host``, in column order."""
+        status_emoji = _STATUS_EMOJI.get(host.status, "⏳")
+        last_scan = host.last_scan.strftime("%H:%M:%S") if host.last_scan else "-"
+        return (
+            host.hostname,
+            _ports_label(tuple(host.ports)),
+            f"{status_emoji} {host.status}",
+            last_scan,
+            host.summary
+        )
+    
+    def update_host_row(self, host: HostEntry) -> None:
+        """Rewrite the cells of one host's row in place, leaving the others alone."""
+        # A scan can finish after its host was deleted
+        if self._hosts_by_name.get(host.hostname) is not host:
+            return
+        table = self.query_one("#host-table", DataTable)
+        for (_, column_key), value in zip(_HOST_COLUMNS, self._row_cells(host)):
+            table.update_cell(host.hostname, column_key, value)
+    
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle row selection in the host table."""
         row_index = event.cursor_row
@@ -470,20 +516,8 @@ Last Scan: {host.last_scan.strftime('%Y-%m-%d %H:%M:%S') if host.last_scan else
                 security = ssl_data.get("security_score", {})
                 
                 grade = security.get("grade", "?")
-                valid_until = cert.get("not_after", "Unknown")[:10]
-                
-                # Extract issuer info
-                issuer_info = cert.get("issuer", "Unknown")
-                if isinstance(issuer_info, str) and "CN=" in issuer_info:
-                    issuer_parts = issuer_info.split(",")
-                    for part in issuer_parts:
-                        if "CN=" in part:
-                            issuer = part.strip().replace("CN=", "")[:19]
-                            break
-                    else:
-                        issuer = "Unknown"
-                else:
-                    issuer = "Unknown"
+                valid_until = (cert.get("not_after_iso") or cert.get("not_after", "Unknown"))[:10]
+                issuer = (cert.get("issuer_cn") or "Unknown")[:19]
                 
                 # Color grade
                 if grade.startswith("A"):
@@ -598,10 +632,8 @@ Last Scan: {host.last_scan.strftime('%Y-%m-%d %H:%M:%S') if host.last_scan else
             info_text += f"[dim italic]💡 {icmp_data.get('hint')}[/dim italic]\n\n"
         
         # Summary timing
-        if host.results.start_time and host.results.end_time:
-            from ..utils import format_duration
-            duration = format_duration(host.results.start_time, host.results.end_time)
-            info_text += f"[dim]Total scan time: {duration:.1f} ms[/dim]\n\n"
+        if host.results.duration_ms is not None:
+            info_text += f"[dim]Total scan time: {host.results.duration_ms:.1f} ms[/dim]\n\n"
         
         info_text += """[bold]Actions:[/bold] [cyan]Enter[/cyan] detailed view • [cyan]s[/cyan] scan • [cyan]d[/cyan] delete"""
         
@@ -658,35 +690,32 @@ Last Scan: {host.last_scan.strftime('%Y-%m-%d %H:%M:%S') if host.last_scan else
             hostname = result["hostname"]
             ports = result["ports"]
             
-            # Add the host
-            self.add_host_entry(hostname, ports)
+            # Add the host (or merge the ports into an existing entry for it)
+            new_host = self.add_host_entry(hostname, ports)
             
             # Select the newly added host
-            if self.hosts:
-                table = self.query_one("#host-table", DataTable)
-                new_host_index = len(self.hosts) - 1
-                self.selected_host_index = new_host_index
-                table.move_cursor(row=new_host_index)
-                self.update_host_info(self.hosts[new_host_index])
+            table = self.query_one("#host-table", DataTable)
+            new_host_index = self.hosts.index(new_host)
+            self.selected_host_index = new_host_index
+            table.move_cursor(row=new_host_index)
+            self.update_host_info(new_host)
             
             status = self.query_one("#status-bar", Static)
-            status.update(f"Added host: {hostname} - Starting scan...")
+            status.update(f"Added host: {new_host.hostname} - Starting scan...")
             
             # Automatically start scanning the new host
-            if self.hosts:
-                new_host = self.hosts[-1]
-                new_host.status = "running"
-                new_host.last_scan = datetime.now()
-                self.refresh_table()
-                
-                # Start scan in background
-                asyncio.create_task(self.scan_host(new_host))
+            new_host.status = "running"
+            new_host.last_scan = datetime.now()
+            self.refresh_table()
+            
+            # Start scan in background
+            asyncio.create_task(self.scan_host(new_host))
     
     async def action_delete_host(self) -> None:
         """Delete the selected host."""
         if 0 <= self.selected_host_index < len(self.hosts):
-            host = self.hosts[self.selected_host_index]
-            self.hosts.pop(self.selected_host_index)
+            host = self.hosts.pop(self.selected_host_index)
+            self._hosts_by_name.pop(host.hostname, None)
             
             # Adjust selection
             if self.selected_host_index >= len(self.hosts) and self.hosts:
@@ -744,16 +773,20 @@ Last Scan: {host.last_scan.strftime('%Y-%m-%d %H:%M:%S') if host.last_scan else
         breadcrumbs.update("eznet > hosts > scanning...")
         
         # Prepare scan tasks
-        tasks = []
-        for host in self.hosts:
-            if host.status != "running":
-                host.status = "running"
-                host.last_scan = datetime.now()
-                tasks.append(self.scan_host(host))
+        targets = [host for host in self.hosts if host.status != "running"]
+        for host in targets:
+            host.status = "running"
+            host.last_scan = datetime.now()
         
         self.refresh_table()
         
-        if tasks:
+        if targets:
+            # Resolve every host in one batch first; the per-host scans then
+            # find their answers in the shared DNS cache instead of each
+            # waiting on its own lookup inside a scan slot
+            await self.checkers.dns.bulk_check([host.hostname for host in targets])
+            tasks = [self.scan_host(host) for host in targets]
+            
             # Run scans concurrently with a reasonable limit
             semaphore = asyncio.Semaphore(10)  # Max 10 concurrent scans
             
@@ -775,12 +808,15 @@ Last Scan: {host.last_scan.strftime('%Y-%m-%d %H:%M:%S') if host.last_scan else
             if len(host.ports) <= 1:
                 # Single port or no specific ports
                 port = host.ports[0] if host.ports else None
-                result = await run_all_checks(host.hostname, port, timeout=5, ssl_check=True)
+                result = await run_all_checks(host.hostname, port, timeout=5, ssl_check=True,
+                                              checkers=self.checkers)
             else:
                 # Multi-port scan
-                result = await run_port_scan(host.hostname, host.ports, timeout=5, ssl_check=True, max_concurrent=5)
+                result = await run_port_scan(host.hostname, host.ports, timeout=5, ssl_check=True, max_concurrent=5,
+                                             checkers=self.checkers)
             
             host.results = result
+            host.summary = _summarize(result)
             host.status = "completed"
             host.error = None
             
@@ -788,6 +824,7 @@ Last Scan: {host.last_scan.strftime('%Y-%m-%d %H:%M:%S') if host.last_scan else
             host.status = "error"
             host.error = str(e)
             host.results = None
+            host.summary = "Error"
         
         # Update display - post message to refresh UI
         self.post_message(RefreshDisplay(host))
@@ -846,10 +883,14 @@ Press any key to return to host info."""
         """Quit the application."""
         self.exit()
     
+    async def on_unmount(self) -> None:
+        """Close the shared checkers' connection pool."""
+        await self.checkers.aclose()
+    
     @on(RefreshDisplay)
     def handle_refresh_display(self, message: RefreshDisplay) -> None:
         """Handle refresh display message from background scan."""
-        self.refresh_table()
+        self.update_host_row(message.host)
         if (0 <= self.selected_host_index < len(self.hosts) and 
             self.hosts[self.selected_host_index] == message.host):
             self.update_host_info(message.host)
@@ -24,7 +24,7 @@ from ..cli import run_all_checks, run_port_scan, EZNetResult
 from ..utils import is_valid_hostname, is_valid_ip
 
 
-@dataclass
+@dataclass(slots=True)
 class HostEntry:
     """Represents a host entry in the TUI."""
     hostname: str
@@ -15,12 +15,12 @@ from textual.widgets import Header, Footer, DataTable, Static
 from textual.binding import Binding
 from textual import work
 
-from ..cli import run_all_checks, EZNetResult
+from ..cli import run_all_checks, CheckerSet, EZNetResult
 from ..utils import is_valid_hostname, is_valid_ip
 from .results import ResultsScreen
 
 
-@dataclass
+@dataclass(slots=True)
 class HostEntry:
     """Represents a host entry in the TUI."""
     hostname: str
@@ -91,6 +91,9 @@ class EZNetApp(App):
         self.hosts: List[HostEntry] = []
         self.selected_host_index = 0
         self.dark = True  # k9s-style dark theme
+        # Kept until unmount: every scan reuses the warm HTTP pool and the
+        # DNS/certificate caches instead of starting cold
+        self.checkers = CheckerSet.create(5, include_headers=False)
     
     def compose(self) -> ComposeResult:
         """Compose the main application layout."""
@@ -252,7 +255,8 @@ class EZNetApp(App):
         try:
             # For now, just scan first port or no port
             port = host.ports[0] if host.ports else None
-            result = await run_all_checks(host.hostname, port, timeout=5, ssl_check=False)
+            result = await run_all_checks(host.hostname, port, timeout=5, ssl_check=False,
+                                          checkers=self.checkers)
             
             host.results = result
             host.status = "completed"
@@ -281,6 +285,10 @@ class EZNetApp(App):
     async def action_quit(self) -> None:
         """Quit the application."""
         self.exit()
+    
+    async def on_unmount(self) -> None:
+        """Close the shared checkers' connection pool."""
+        await self.checkers.aclose()
 
 
 def run_tui():
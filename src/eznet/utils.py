@@ -5,9 +5,11 @@ This module contains helper functions for validation, formatting, and common ope
 """
 
 import re
+import datetime
 import ipaddress
+import socket
 import time
-from typing import Union, Optional
+from typing import Iterable, Iterator, Union, Optional
 
 
 def is_valid_ip(ip_string: str) -> bool:
@@ -20,11 +22,21 @@ def is_valid_ip(ip_string: str) -> bool:
     Returns:
         True if valid IP address, False otherwise
     """
-    try:
-        ipaddress.ip_address(ip_string)
-        return True
-    except ValueError:
-        return False
+    # inet_pton is a single C call per family, much cheaper than ipaddress
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, ip_string)
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+# Dot-separated labels of 1-63 alphanumerics/hyphens, no hyphen at either
+# end of a label, optional trailing dot
+_HOSTNAME_RE = re.compile(
+    r'(?!-)[A-Za-z0-9-]{1,63}(?<!-)(?:\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))*\.?'
+)
 
 
 def is_valid_hostname(hostname: str) -> bool:
@@ -40,24 +52,59 @@ def is_valid_hostname(hostname: str) -> bool:
     if not hostname or len(hostname) > 253:
         return False
     
-    # Check if it's an IP address
-    if is_valid_ip(hostname):
+    # Dotted IPv4 already matches the hostname pattern; IPv6 needs is_valid_ip
+    if _HOSTNAME_RE.fullmatch(hostname):
         return True
+    return ':' in hostname and is_valid_ip(hostname)
+
+
+def is_valid_host(host: str) -> bool:
+    """
+    Check if a string is usable as a target: a hostname or an IP address.
     
-    # Remove trailing dot if present
-    if hostname.endswith('.'):
-        hostname = hostname[:-1]
-    
-    # Check each label in the hostname
-    labels = hostname.split('.')
-    for label in labels:
-        if not label or len(label) > 63:
-            return False
-        # Label must start and end with alphanumeric, can contain hyphens in middle
-        if not re.match(r'^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$', label):
-            return False
+    Args:
+        host: String to validate
+        
+    Returns:
+        True if valid hostname or IP address, False otherwise
+    """
+    return is_valid_hostname(host) or is_valid_ip(host)
+
+
+# Largest CIDR block expand_hosts accepts (an IPv4 /16)
+MAX_CIDR_ADDRESSES = 65536
+
+
+def expand_hosts(entries: Iterable[str], max_addresses: int = MAX_CIDR_ADDRESSES) -> Iterator[str]:
+    """
+    Yield target hosts, expanding CIDR entries like ``10.0.0.0/30`` lazily.
     
-    return True
+    Args:
+        entries: Hostnames, IP addresses or CIDR networks; blanks are skipped
+        max_addresses: Largest network (in addresses) that may be expanded
+        
+    Yields:
+        One host per usable address or plain entry
+        
+    Raises:
+        ValueError: If an entry containing '/' is not a valid network, or
+            is larger than ``max_addresses``
+    """
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        if '/' in entry:
+            network = ipaddress.ip_network(entry, strict=False)
+            # Checked before expanding: an IPv6 /64 alone is 2**64 addresses
+            if network.num_addresses > max_addresses:
+                raise ValueError(
+                    f"Network {entry} has {network.num_addresses} addresses; "
+                    f"at most {max_addresses} can be scanned"
+                )
+            yield from map(str, network.hosts())
+        else:
+            yield entry
 
 
 def is_valid_port(port: Union[int, str]) -> bool:
@@ -94,6 +141,36 @@ def format_duration(start_time: float, end_time: Optional[float] = None) -> floa
     return (end_time - start_time) * 1000
 
 
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+
+
+def format_cert_date(cert_time: str) -> Optional[str]:
+    """
+    Convert a certificate time like ``Jan  5 12:00:00 2025 GMT`` to ``2025-01-05``.
+    
+    Args:
+        cert_time: notBefore/notAfter string as reported by ssl
+        
+    Returns:
+        ISO date string, or None if the value is not in that format
+    """
+    # Fixed layout: "Mmm DD HH:MM:SS YYYY GMT", day space-padded
+    if len(cert_time) == 24 and cert_time.endswith(" GMT"):
+        month = _MONTHS.get(cert_time[:3])
+        day = cert_time[4:6].strip()
+        year = cert_time[16:20]
+        if month and day.isdigit() and year.isdigit():
+            return f"{year}-{month:02d}-{int(day):02d}"
+    
+    try:
+        return datetime.datetime.strptime(cert_time, "%b %d %H:%M:%S %Y GMT").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
 def format_bytes(bytes_count: int) -> str:
     """
     Format bytes count in human-readable format.
@@ -280,6 +357,98 @@ def get_common_ports() -> list[int]:
     ]
 
 
+# Well-known service names by port, built once at import
+PORT_DESCRIPTIONS = {
+    21: "FTP",
+    22: "SSH",
+    23: "Telnet",
+    25: "SMTP",
+    53: "DNS",
+    79: "Finger",
+    80: "HTTP",
+    110: "POP3",
+    111: "RPC",
+    119: "NNTP",
+    135: "RPC",
+    139: "NetBIOS",
+    143: "IMAP",
+    161: "SNMP",
+    194: "IRC",
+    389: "LDAP",
+    443: "HTTPS",
+    445: "SMB",
+    465: "SMTPS",
+    500: "IPSec",
+    554: "RTSP",
+    563: "NNTPS",
+    587: "SMTP-Submit",
+    636: "LDAPS",
+    873: "rsync",
+    993: "IMAPS",
+    995: "POP3S",
+    1080: "SOCKS",
+    1194: "OpenVPN",
+    1433: "MSSQL",
+    1521: "Oracle",
+    1723: "PPTP",
+    1935: "RTMP",
+    2049: "NFS",
+    2121: "FTP-Proxy",
+    2375: "Docker",
+    2376: "Docker-TLS",
+    3000: "Dev-Server",
+    3268: "LDAP-GC",
+    3269: "LDAP-GC-SSL",
+    3306: "MySQL",
+    3389: "RDP",
+    4000: "Dev-Server",
+    4500: "IPSec-NAT",
+    5000: "Dev-Server",
+    5060: "SIP",
+    5061: "SIP-TLS",
+    5432: "PostgreSQL",
+    5601: "Kibana",
+    5900: "VNC",
+    5984: "CouchDB",
+    6000: "X11",
+    6379: "Redis",
+    6667: "IRC",
+    7001: "Cassandra",
+    7777: "Game-Server",
+    8000: "HTTP-Alt",
+    8001: "HTTP-Alt",
+    8008: "HTTP-Alt",
+    8009: "HTTP-Alt",
+    8080: "HTTP-Proxy",
+    8081: "HTTP-Alt",
+    8086: "InfluxDB",
+    8090: "HTTP-Alt",
+    8181: "HTTP-Alt",
+    8443: "HTTPS-Alt",
+    8554: "RTSP-Alt",
+    8888: "HTTP-Alt",
+    9000: "App-Server",
+    9001: "App-Server",
+    9002: "App-Server",
+    9003: "App-Server",
+    9080: "HTTP-Alt",
+    9090: "Prometheus",
+    9091: "Pushgateway",
+    9093: "Alertmanager",
+    9200: "Elasticsearch",
+    9300: "Elasticsearch",
+    9443: "HTTPS-Alt",
+    9999: "App-Server",
+    10000: "Webmin",
+    25565: "Minecraft",
+    27015: "Steam",
+    27017: "MongoDB",
+    27018: "MongoDB",
+    27019: "MongoDB",
+    50000: "SAP"
+}
+
+
 def get_port_description(port: int) -> str:
     """
     Get description for a port number.
@@ -290,97 +459,7 @@ def get_port_description(port: int) -> str:
     Returns:
         Service description or "Unknown"
     """
-    port_descriptions = {
-        21: "FTP",
-        22: "SSH",
-        23: "Telnet",
-        25: "SMTP",
-        53: "DNS",
-        79: "Finger",
-        80: "HTTP",
-        110: "POP3",
-        111: "RPC",
-        119: "NNTP",
-        135: "RPC",
-        139: "NetBIOS",
-        143: "IMAP",
-        161: "SNMP",
-        194: "IRC",
-        389: "LDAP",
-        443: "HTTPS",
-        445: "SMB",
-        465: "SMTPS",
-        500: "IPSec",
-        554: "RTSP",
-        563: "NNTPS",
-        587: "SMTP-Submit",
-        636: "LDAPS",
-        873: "rsync",
-        993: "IMAPS",
-        995: "POP3S",
-        1080: "SOCKS",
-        1194: "OpenVPN",
-        1433: "MSSQL",
-        1521: "Oracle",
-        1723: "PPTP",
-        1935: "RTMP",
-        2049: "NFS",
-        2121: "FTP-Proxy",
-        2375: "Docker",
-        2376: "Docker-TLS",
-        3000: "Dev-Server",
-        3268: "LDAP-GC",
-        3269: "LDAP-GC-SSL",
-        3306: "MySQL",
-        3389: "RDP",
-        4000: "Dev-Server",
-        4500: "IPSec-NAT",
-        5000: "Dev-Server",
-        5060: "SIP",
-        5061: "SIP-TLS",
-        5432: "PostgreSQL",
-        5601: "Kibana",
-        5900: "VNC",
-        5984: "CouchDB",
-        6000: "X11",
-        6379: "Redis",
-        6667: "IRC",
-        7001: "Cassandra",
-        7777: "Game-Server",
-        8000: "HTTP-Alt",
-        8001: "HTTP-Alt",
-        8008: "HTTP-Alt",
-        8009: "HTTP-Alt",
-        8080: "HTTP-Proxy",
-        8081: "HTTP-Alt",
-        8086: "InfluxDB",
-        8090: "HTTP-Alt",
-        8181: "HTTP-Alt",
-        8443: "HTTPS-Alt",
-        8554: "RTSP-Alt",
-        8888: "HTTP-Alt",
-        9000: "App-Server",
-        9001: "App-Server",
-        9002: "App-Server",
-        9003: "App-Server",
-        9080: "HTTP-Alt",
-        9090: "Prometheus",
-        9091: "Pushgateway",
-        9093: "Alertmanager",
-        9200: "Elasticsearch",
-        9300: "Elasticsearch",
-        9443: "HTTPS-Alt",
-        9999: "App-Server",
-        10000: "Webmin",
-        25565: "Minecraft",
-        27015: "Steam",
-        27017: "MongoDB",
-        27018: "MongoDB",
-        27019: "MongoDB",
-        50000: "SAP"
-    }
-    
-    return port_descriptions.get(port, "Unknown")
+    return PORT_DESCRIPTIONS.get(port, "Unknown")
 
 
 def sanitize_hostname(hostname: str) -> str:
@@ -14,6 +14,8 @@ from eznet.utils import (
     is_valid_hostname, 
     is_valid_port, 
     format_duration,
+    format_cert_date,
+    expand_hosts,
     parse_host_port,
     get_port_description
 )
@@ -75,6 +77,15 @@ class TestUtils:
         assert is_valid_port(-1) is False
         assert is_valid_port("not_a_port") is False
     
+    def test_expand_hosts(self):
+        """Test CIDR expansion of host entries."""
+        assert list(expand_hosts(["google.com", " ", "10.0.0.0/30"])) == ["google.com", "10.0.0.1", "10.0.0.2"]
+        with pytest.raises(ValueError):
+            list(expand_hosts(["10.0.0.0/33"]))
+        with pytest.raises(ValueError):
+            next(expand_hosts(["2001:db8::/64"]))
+        assert len(list(expand_hosts(["10.0.0.0/16"]))) == 65534
+    
     def test_format_duration(self):
         """Test duration formatting."""
         start_time = 1000.0
@@ -83,6 +94,12 @@ class TestUtils:
         duration = format_duration(start_time, end_time)
         assert duration == 1500.0  # 1.5 seconds = 1500ms
     
+    def test_format_cert_date(self):
+        """Test certificate date conversion."""
+        assert format_cert_date("Jan  5 12:00:00 2025 GMT") == "2025-01-05"
+        assert format_cert_date("Dec 31 23:59:59 2030 GMT") == "2030-12-31"
+        assert format_cert_date("not a date") is None
+    
     def test_parse_host_port(self):
         """Test host:port parsing."""
         # Host only
@@ -242,7 +259,7 @@ class TestICMPChecker:
         # Localhost should be reachable
         if result["success"]:
             assert result["response_time_ms"] >= 0
-            assert result["method"] in ["system_command", "raw_socket"]
+            assert result["method"] in ["icmp_socket", "system_command", "raw_socket"]
     
     def test_parse_ping_time(self, icmp_checker):
         """Test ping time parsing from output."""
@@ -262,6 +279,27 @@ class TestICMPChecker:
         assert time_ms is None
 
 
+class TestSSLChecker:
+    """Test SSL certificate analysis helpers."""
+    
+    def test_hostname_matches(self):
+        """Test hostname matching against SAN entries and the CN."""
+        from eznet.ssl_check import _hostname_matches
+        
+        san = [("DNS", "example.com"), ("DNS", "*.example.com"), ("IP Address", "192.0.2.1")]
+        assert _hostname_matches("example.com", san, "CN=other.org") is True
+        assert _hostname_matches("WWW.Example.com.", san, "") is True
+        assert _hostname_matches("a.b.example.com", san, "") is False
+        assert _hostname_matches("notexample.com", san, "CN=example.com") is False
+        assert _hostname_matches("192.0.2.1", san, "") is True
+        assert _hostname_matches("192.0.2.2", san, "") is False
+        # Wildcards never cover a bare top-level domain
+        assert _hostname_matches("example.com", [("DNS", "*.com")], "") is False
+        # Without SANs only an exact CN counts
+        assert _hostname_matches("example.com", [], "CN=notexample.com, O=Acme") is False
+        assert _hostname_matches("example.com", [], "CN=example.com, O=Acme") is True
+
+
 class TestIntegration:
     """Integration tests for full EZNet functionality."""
     
@@ -295,6 +333,54 @@ class TestIntegration:
         assert result.tcp_result is not None
         assert result.icmp_result is not None
 
+    def test_dump_json_multi_host_results(self):
+        """Test JSON output of multi-host results with port-keyed dicts."""
+        import json
+        from eznet.cli import EZNetResult, dump_json
+        
+        result = EZNetResult("example.com", [80])
+        result.tcp_results[80] = {"success": True, "port": 80}
+        payload = {"example.com": {"success": True, "results": result.to_dict()}}
+        
+        for indent in (True, False):
+            decoded = json.loads(dump_json(payload, indent))
+            assert decoded["example.com"]["results"]["tcp"]["80"]["success"] is True
+
+
+class TestMonitorStore:
+    """Test the compressed monitoring store."""
+    
+    def test_monitor_store_round_trip(self, tmp_path):
+        """Test that flushed monitoring samples load back unchanged."""
+        import math
+        from advanced_features import MonitorStore
+        
+        store = MonitorStore(str(tmp_path), block_size=4)
+        # Irregular spacing, a backwards step and non-finite response times,
+        # spread over several blocks with a partial one at the end
+        timestamps = [1700000000.0, 1700000030.0, 1700000031.5, 1700000200.25,
+                      1700000199.0, 1700000230.0, 1700000260.0, 1700009999.999, 1700010000.0]
+        response_times = [12.5, float("nan"), float("inf"), 0.0, -float("inf"),
+                          12.5, 13.25, 1e-9, 123456.789]
+        healthy = [True, False, True, True, False, True, False, False, True]
+        for sample in zip(timestamps, response_times, healthy):
+            store.append("2001:db8::1", *sample)
+        store.flush()
+        
+        loaded = store.load("2001:db8::1")
+        assert len(loaded) == len(timestamps)
+        for (ts, rt, ok), expected in zip(loaded, zip(timestamps, response_times, healthy)):
+            assert ts == pytest.approx(expected[0], abs=1e-3)
+            assert (math.isnan(rt) and math.isnan(expected[1])) or rt == expected[1]
+            assert ok is expected[2]
+        
+        # Hosts that only differ in characters a filename can't hold get separate files
+        assert len({store.path_for(h) for h in ("a:b", "a_b", "a/b", "a%3Ab")}) == 4
+        assert store.load("2001_db8__1") == []
+        
+        with pytest.raises(ValueError):
+            MonitorStore(str(tmp_path), block_size=65536)
+
 
 # Pytest configuration for running tests
 if __name__ == "__main__":